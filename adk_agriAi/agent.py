@@ -14,110 +14,299 @@
 
 """Farmer AI Agent using Google Agent Development Kit (ADK)"""
 
+import os
+
+# Pin BLAS/TF thread pools before numpy/tensorflow spin theirs up.
+# Defaults favor single-request latency (intra-op = physical cores,
+# inter-op = 1); concurrent deployments can flip these via the env.
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+os.environ.setdefault("TF_NUM_INTRAOP_THREADS", str(os.cpu_count()))
+os.environ.setdefault("TF_NUM_INTEROP_THREADS", "1")
+
+import asyncio
+import functools
+import io
 import json
 import logging
-import os
 import pickle
+import queue
+import re
+import threading
+import time
 import numpy as np
-import tensorflow as tf
-import tempfile
 import base64
+import binascii
+import hashlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, Any, List, Optional
 
+from cachetools import LRUCache, TTLCache
 from google.adk.agents import Agent
 from google.adk.tools.function_tool import FunctionTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
+
+import json_fast
+from tool_cache import cached_tool
+
+# TTL caches: repeat agent turns (e.g. "show me the last 3 campaigns")
+# become dict lookups instead of Firestore round-trips, and identical soil
+# readings skip the crop model entirely. Writes clear the fetch cache.
+_fetch_cache = TTLCache(maxsize=512, ttl=30)
+_crop_prediction_cache = TTLCache(maxsize=256, ttl=300)
+
+# cachetools caches are not thread-safe, and the prediction caches are hit
+# from asyncio.to_thread and pool workers concurrently; one RLock guards
+# their bookkeeping (same pattern as tool_cache)
+_prediction_cache_lock = threading.RLock()
+
+# Re-uploaded images are common in chat; keying on a SHA-1 of the raw bytes
+# lets repeat classifications skip decode + inference entirely.
+_image_prediction_cache = LRUCache(maxsize=64)
+
+# Optional perceptual-hash tier: near-identical re-uploads (recompressed or
+# resized copies) map to the same pHash even when their bytes differ, so
+# they skip the model forward pass. Entries expire after 24h.
+try:
+    import imagehash
+except ImportError:
+    imagehash = None
+_phash_prediction_cache = TTLCache(maxsize=1024, ttl=24 * 3600)
 
 # Import for LLM integration - removed as ADK handles this through agent.model
 # ADK agents handle LLM integration through the model parameter
-# Import Firestore configuration
-try:
-    import firebase_admin
-    from firebase_admin import credentials, firestore
-    
-    db = None
-    def init_firestore():
-        """
-        Initializes the Firestore database connection using the service account key.
-        """
-        global db
-        if not firebase_admin._apps:
-            try:
-                # The path to your service account key JSON file
-                script_dir = os.path.dirname(os.path.abspath(__file__))
-                service_key_path = os.path.join(script_dir, "serviceKey.json")
-                cred = credentials.Certificate(service_key_path)
-                firebase_admin.initialize_app(cred)
-                db = firestore.client()
-                print("✅ Firestore initialized successfully.")
-                return db
-            except FileNotFoundError:
-                print(f"🔥 Failed to initialize Firestore: serviceKey.json file not found")
-                print("   Please ensure 'serviceKey.json' is in the correct directory.")
-                return None
-            except Exception as e:
-                print(f"🔥 Failed to initialize Firestore: {e}")
-                print("   Please check your serviceKey.json file and Firebase configuration.")
-                return None
-        return db
-
-    def get_db():
-        """Returns the Firestore database client instance."""
-        global db
-        if db is None:
-            db = init_firestore()
-        return db
-
-    db = get_db()
-    FIRESTORE_AVAILABLE = db is not None
-    if FIRESTORE_AVAILABLE:
-        print("✅ Firestore integration enabled")
-    else:
-        print("⚠️ Firestore not available - running in offline mode")
-        
-except Exception as e:
-    print(f"⚠️ Firestore not available: {e}")
-    db = None
-    FIRESTORE_AVAILABLE = False
+# Firestore access goes through the shared lazily-initialized client in
+# clients.py so every module reuses one gRPC channel pool.
+from clients import get_db, get_firestore as _get_firestore
 
 # Load ML Models
 working_dir = os.path.dirname(os.path.abspath(__file__))
 
 # Load Crop Recommendation Model
+# Prefer the compiled ONNX build (produced offline by convert_crop_model.py) -
+# onnxruntime runs the forest in native code, so single-row predictions are
+# orders of magnitude faster than sklearn's predict_proba and we avoid
+# unpickling an sklearn object at import time.
 CROP_MODEL_LOADED = False
+crop_model = None
+crop_session = None
+crop_classes = None
 try:
-    crop_model_path = os.path.join(working_dir, "RandomForest-2.pkl")
-    with open(crop_model_path, 'rb') as file:
-        crop_model = pickle.load(file)
-    CROP_MODEL_LOADED = True
-    print("✅ Crop recommendation model loaded successfully")
+    onnx_model_path = os.path.join(working_dir, "crop_model.onnx")
+    crop_classes_path = os.path.join(working_dir, "crop_model_classes.json")
+    # EAFP: open each artifact directly and fall through on FileNotFoundError
+    # instead of stat-ing paths we are about to open anyway
+    try:
+        with open(crop_classes_path) as f:
+            crop_classes = np.array(json.load(f))
+        import onnxruntime as ort
+        crop_session = ort.InferenceSession(onnx_model_path, providers=["CPUExecutionProvider"])
+        CROP_MODEL_LOADED = True
+        print("✅ Crop recommendation model loaded successfully (ONNX)")
+    except FileNotFoundError:
+        try:
+            # mmap the tree arrays so worker processes share physical pages
+            # instead of each holding a private copy of the forest
+            import joblib
+            crop_model = joblib.load(
+                os.path.join(working_dir, "RandomForest-2.joblib"), mmap_mode="r"
+            )
+            print("✅ Crop recommendation model loaded successfully (joblib mmap)")
+        except FileNotFoundError:
+            with open(os.path.join(working_dir, "RandomForest-2.pkl"), 'rb') as file:
+                crop_model = pickle.load(file)
+            print("✅ Crop recommendation model loaded successfully (pickle fallback)")
+        crop_classes = np.asarray(crop_model.classes_)
+        CROP_MODEL_LOADED = True
+        print("   Run convert_crop_model.py to generate crop_model.onnx for faster predictions")
 except Exception as e:
     print(f"⚠️ Error loading crop model: {e}")
     crop_model = None
 
-# Load Disease Classification Model
+# Disease Classification Model (lazy-loaded)
+# Importing TensorFlow and restoring the Keras model costs seconds of startup
+# and hundreds of MB of RSS, so both are deferred until the first image
+# classification request. Only the cheap class_indices JSON is read here.
 DISEASE_MODEL_LOADED = False
+model_path = os.path.join(working_dir, "plant_disease_prediction_model.h5")
+class_indices_path = os.path.join(working_dir, "class_indices.json")
 try:
-    model_path = os.path.join(working_dir, "plant_disease_prediction_model.h5")
-    class_indices_path = os.path.join(working_dir, "class_indices.json")
-    if os.path.exists(model_path) and os.path.exists(class_indices_path):
-        disease_model = tf.keras.models.load_model(model_path)
+    if os.path.exists(model_path):
         with open(class_indices_path) as f:
             class_indices = json.load(f)
+        # Int-indexed tuple so each prediction skips a str() allocation and
+        # dict hash when mapping the argmax index to a class name
+        CLASS_NAMES = [None] * (max(map(int, class_indices)) + 1)
+        for k, v in class_indices.items():
+            CLASS_NAMES[int(k)] = v
+        CLASS_NAMES = tuple(CLASS_NAMES)
         DISEASE_MODEL_LOADED = True
-        print("✅ Disease classification model loaded successfully")
+        print("✅ Disease classification model available (loads on first use)")
     else:
         print("⚠️ Model files not found - disease classification will be unavailable")
-        disease_model = None
         class_indices = None
+        CLASS_NAMES = None
+except FileNotFoundError:
+    print("⚠️ Model files not found - disease classification will be unavailable")
+    class_indices = None
+    CLASS_NAMES = None
 except Exception as e:
-    print(f"⚠️ Error loading disease model: {e}")
-    disease_model = None
+    print(f"⚠️ Error loading disease model metadata: {e}")
     class_indices = None
+    CLASS_NAMES = None
+
+tflite_model_path = os.path.join(working_dir, "plant_disease.tflite")
+saved_model_path = os.path.join(working_dir, "plant_disease_savedmodel")
+
+@functools.lru_cache(maxsize=1)
+def _get_disease_predictor():
+    """Imports TensorFlow and returns a predict function on first use.
+
+    Prefers the int8-quantized TFLite build (produced offline by
+    convert_disease_model.py) - the TFLite interpreter skips the Keras
+    predict() training-path overhead and runs quantized XNNPACK kernels.
+    Falls back to the Keras .h5 model when the .tflite file is absent.
+    """
+    import tensorflow as tf
+
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(
+            int(os.environ["TF_NUM_INTRAOP_THREADS"])
+        )
+        tf.config.threading.set_inter_op_parallelism_threads(
+            int(os.environ["TF_NUM_INTEROP_THREADS"])
+        )
+    except RuntimeError:
+        pass  # TF context already initialized elsewhere - keep its settings
+
+    if os.path.exists(tflite_model_path):
+        interpreter = tf.lite.Interpreter(
+            model_path=tflite_model_path, num_threads=os.cpu_count()
+        )
+        interpreter.allocate_tensors()
+        input_index = interpreter.get_input_details()[0]["index"]
+        output_index = interpreter.get_output_details()[0]["index"]
+
+        allocated_batch = interpreter.get_input_details()[0]["shape"][0]
+
+        def predict(img_array):
+            # Re-allocate when the micro-batcher hands us a different batch size
+            nonlocal allocated_batch
+            if allocated_batch != img_array.shape[0]:
+                interpreter.resize_tensor_input(input_index, img_array.shape)
+                interpreter.allocate_tensors()
+                allocated_batch = img_array.shape[0]
+            interpreter.set_tensor(input_index, img_array)
+            interpreter.invoke()
+            return interpreter.get_tensor(output_index)
+
+        print("✅ Disease model running through TFLite interpreter")
+    elif os.path.isdir(saved_model_path):
+        # SavedModel deserializes a frozen serving function directly instead
+        # of rebuilding the Keras graph from the .h5 JSON config
+        loaded = tf.saved_model.load(saved_model_path)
+        infer = loaded.signatures["serving_default"]
+        output_key = list(infer.structured_outputs)[0]
+
+        def predict(img_array):
+            return infer(tf.constant(img_array))[output_key].numpy()
+
+        print("✅ Disease model running through SavedModel serving signature")
+    else:
+        model = tf.keras.models.load_model(model_path, compile=False)
+
+        # Trace one concrete function instead of model.predict() - the fixed
+        # image shape lets XLA compile the graph per batch size and skips the
+        # Keras per-call scaffolding. The batch dimension stays dynamic so
+        # the micro-batcher can feed stacked requests through a single call.
+        @tf.function(
+            jit_compile=True,
+            input_signature=[tf.TensorSpec((None, 224, 224, 3), tf.float32)],
+        )
+        def _infer(x):
+            return model(x, training=False)
+
+        def predict(img_array):
+            return _infer(tf.constant(img_array)).numpy()
+
+        print("✅ Disease model running through Keras (run convert_disease_model.py for TFLite)")
+
+    # Warm up with a dummy call so the first real prediction isn't slow
+    predict(np.zeros((1, 224, 224, 3), np.float32))
+    return predict
+
+# Optional eager warm-up: a background thread pays the TF import, model
+# load, and warm-up forward pass during process startup instead of on the
+# first farmer's request. Off by default so campaign-only workloads keep
+# the lazy-load RSS savings; long-lived image-serving deployments set
+# WARM_DISEASE_MODEL=1 in the environment.
+if DISEASE_MODEL_LOADED and os.environ.get("WARM_DISEASE_MODEL") == "1":
+    threading.Thread(
+        target=_get_disease_predictor, daemon=True, name="disease-model-warmup"
+    ).start()
+
+# Micro-batching knobs, mirroring TF-Serving's batch scheduler settings
+BATCH_SIZE = int(os.environ.get("BATCH_SIZE", "8"))
+BATCH_TIMEOUT_MS = float(os.environ.get("BATCH_TIMEOUT_MS", "20"))
+
+class _DiseaseBatcher:
+    """Gathers concurrent single-image requests into one batched model call.
+
+    A worker thread pops up to max_batch_size queued images (waiting at most
+    batch_timeout_ms for stragglers), stacks them, runs one prediction, and
+    resolves each caller's Future with its own row. This amortizes the
+    Python<->TF crossover and kernel setup across concurrent users.
+    """
+
+    def __init__(self, max_batch_size=BATCH_SIZE, batch_timeout_ms=BATCH_TIMEOUT_MS):
+        self.max_batch_size = max_batch_size
+        self.batch_timeout = batch_timeout_ms / 1000.0
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit_async(self, img_array):
+        """Enqueues an image and returns a Future for its prediction row."""
+        future = Future()
+        self._queue.put((img_array, future))
+        return future
+
+    def submit(self, img_array):
+        """Blocks until the batched prediction for this image is ready."""
+        return self.submit_async(img_array).result()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.batch_timeout
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                predict_fn = _get_disease_predictor()
+                x_batch = np.concatenate([img for img, _ in batch], axis=0)
+                predictions = predict_fn(x_batch)
+                for i, (_, future) in enumerate(batch):
+                    future.set_result(predictions[i:i + 1])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+_disease_batcher = _DiseaseBatcher()
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"))
 logger = logging.getLogger(__name__)
 
 # --- Pydantic Models for Firestore Operations ---
@@ -140,8 +329,21 @@ class FilterCondition(BaseModel):
     op: str = Field(description="Comparison operator (==, >, <, >=, <=, in)")
     value: Any = Field(description="The value to compare against")
 
+# Compiled once so each fetch validates its whole filter list (and parses
+# the JSON) in a single pass instead of building models per condition
+_FILTER_ADAPTER = TypeAdapter(List[FilterCondition])
+
 # --- Firestore Tools ---
-def create_campaign_tool(title: str, crop: str, cropType: str, location: str, estimatedQuantity: str, 
+# Static campaign fields, merged into each create; timestamps are assigned
+# server-side so nothing here varies per call
+_CAMPAIGN_DEFAULTS = {
+    "status": "active",
+    "totalBids": 0,
+    "interestedBuyers": 0,
+    "campaignType": "contract_farming",
+}
+
+async def create_campaign_tool(title: str, crop: str, cropType: str, location: str, estimatedQuantity: str, 
                         harvestDate: str, minimumPrice: str, qualityGrade: str = "A", 
                         farmingMethod: str = "conventional", notes: str = "") -> str:
     """
@@ -162,19 +364,20 @@ def create_campaign_tool(title: str, crop: str, cropType: str, location: str, es
     Returns:
         Success message with campaign ID or error message
     """
-    if not FIRESTORE_AVAILABLE:
+    db, firestore = _get_firestore()
+    if db is None:
         return "Error: Firestore database is not available. Please check configuration."
-    
+
     try:
         print(f"\n🤖 Creating new campaign: {title}...")
         
         # Prepare contract farming campaign data
         data = {
+            **_CAMPAIGN_DEFAULTS,
             "title": title,
             "crop": crop,
             "cropType": cropType,
             "location": location,
-            "status": "active",
             "estimatedQuantity": estimatedQuantity,
             "harvestDate": harvestDate,
             "minimumPrice": minimumPrice,
@@ -182,15 +385,13 @@ def create_campaign_tool(title: str, crop: str, cropType: str, location: str, es
             "farmingMethod": farmingMethod,
             "notes": notes,
             "currentHighestBid": minimumPrice,
-            "totalBids": 0,
-            "interestedBuyers": 0,
-            "campaignType": "contract_farming",
-            "createdAt": datetime.utcnow(),
-            "updatedAt": datetime.utcnow()
+            "createdAt": firestore.SERVER_TIMESTAMP,
+            "updatedAt": firestore.SERVER_TIMESTAMP
         }
         
         # Add document to Firestore
-        _, doc_ref = db.collection("campaigns").add(data)
+        _, doc_ref = await db.collection("campaigns").add(data)
+        _fetch_cache.clear()  # new campaign must show up in subsequent fetches
         success_msg = f"✅ Successfully created campaign '{title}' with ID: {doc_ref.id}"
         print(f"   - {success_msg}")
         return success_msg
@@ -200,7 +401,7 @@ def create_campaign_tool(title: str, crop: str, cropType: str, location: str, es
         print(f"   - {error_msg}")
         return error_msg
 
-def fetch_documents_tool(collection_name: str, filters: Optional[str] = None, limit: Optional[int] = None) -> str:
+async def fetch_documents_tool(collection_name: str, filters: Optional[str] = None, limit: Optional[int] = None, fields: Optional[str] = None) -> str:
     """
     Fetches documents from a Firestore collection with optional filters.
     If collection_name is not available or empty, fetches last 3 campaigns.
@@ -209,34 +410,46 @@ def fetch_documents_tool(collection_name: str, filters: Optional[str] = None, li
         collection_name: Name of collection (campaigns, bids, orders, contracts)
         filters: JSON string of filter conditions [{"field": "status", "op": "==", "value": "active"}]
         limit: Maximum number of documents to return
+        fields: Optional comma-separated field names; projects the query
+            server-side so only those fields come over the wire
     
     Returns:
         JSON string of documents or error message
     """
-    if not FIRESTORE_AVAILABLE:
+    db, firestore = _get_firestore()
+    if db is None:
         return "Error: Firestore database is not available."
-    
+
     # If collection_name is not provided or empty, default to fetching last 3 campaigns
     if not collection_name or collection_name.strip() == "":
         print(f"\n🤖 No collection specified, fetching last 3 campaigns...")
         collection_name = "campaigns"
         limit = 3
-        
+
+    cache_key = (collection_name, filters or "", limit or 0, fields or "")
+    cached = _fetch_cache.get(cache_key)
+    if cached is not None:
+        print(f"\n🤖 Returning cached documents for {collection_name}")
+        return cached
+
     try:
         print(f"\n🤖 Fetching documents from {collection_name}...")
         query = db.collection(collection_name)
         
         # Apply filters if provided
         if filters:
-            filter_list = json.loads(filters)
-            for f in filter_list:
-                validated_filter = FilterCondition(**f)
+            for validated_filter in _FILTER_ADAPTER.validate_json(filters):
                 query = query.where(
                     field_path=validated_filter.field,
                     op_string=validated_filter.op,
                     value=validated_filter.value
                 )
         
+        # Server-side projection: Firestore only sends the selected fields,
+        # cutting payload bytes and deserialization for list-style turns
+        if fields:
+            query = query.select([f.strip() for f in fields.split(",") if f.strip()])
+        
         # If no specific limit is set and we're fetching campaigns, order by creation date
         if collection_name == "campaigns" and not filters:
             query = query.order_by("createdAt", direction=firestore.Query.DESCENDING)
@@ -246,8 +459,7 @@ def fetch_documents_tool(collection_name: str, filters: Optional[str] = None, li
             query = query.limit(limit)
         
         # Execute query
-        docs = query.stream()
-        results = [{"id": doc.id, **doc.to_dict()} for doc in docs]
+        results = [{"id": doc.id, **doc.to_dict()} async for doc in query.stream()]
         
         if not results:
             # If no documents found in specified collection, try fetching last 3 campaigns as fallback
@@ -255,19 +467,20 @@ def fetch_documents_tool(collection_name: str, filters: Optional[str] = None, li
                 print(f"   - No documents found in {collection_name}, fetching last 3 campaigns as fallback...")
                 try:
                     fallback_query = db.collection("campaigns").order_by("createdAt", direction=firestore.Query.DESCENDING).limit(3)
-                    fallback_docs = fallback_query.stream()
-                    results = [{"id": doc.id, **doc.to_dict()} for doc in fallback_docs]
+                    results = [{"id": doc.id, **doc.to_dict()} async for doc in fallback_query.stream()]
                     if results:
                         print(f"   - Found {len(results)} campaigns as fallback")
-                        return json.dumps(results, default=str, indent=2)
+                        return json_fast.dumps(results, default=str, indent=True)
                 except Exception as fallback_error:
                     print(f"   - Fallback also failed: {fallback_error}")
             
             return f"No documents found in {collection_name} collection matching the criteria."
         
         print(f"   - Found {len(results)} documents")
-        return json.dumps(results, default=str, indent=2)
-        
+        payload = json_fast.dumps(results, default=str, indent=True)
+        _fetch_cache[cache_key] = payload
+        return payload
+
     except Exception as e:
         error_msg = f"Error fetching documents from {collection_name}: {str(e)}"
         print(f"   - {error_msg}")
@@ -277,17 +490,16 @@ def fetch_documents_tool(collection_name: str, filters: Optional[str] = None, li
             print(f"   - Attempting fallback to fetch last 3 campaigns...")
             try:
                 fallback_query = db.collection("campaigns").order_by("createdAt", direction=firestore.Query.DESCENDING).limit(3)
-                fallback_docs = fallback_query.stream()
-                results = [{"id": doc.id, **doc.to_dict()} for doc in fallback_docs]
+                results = [{"id": doc.id, **doc.to_dict()} async for doc in fallback_query.stream()]
                 if results:
                     print(f"   - Fallback successful: Found {len(results)} campaigns")
-                    return json.dumps(results, default=str, indent=2)
+                    return json_fast.dumps(results, default=str, indent=True)
             except Exception as fallback_error:
                 print(f"   - Fallback also failed: {fallback_error}")
         
         return error_msg
 
-def update_campaign_tool(campaign_id: str, updates: str) -> str:
+async def update_campaign_tool(campaign_id: str, updates: str) -> str:
     """
     Updates an existing campaign in Firestore.
     
@@ -298,19 +510,21 @@ def update_campaign_tool(campaign_id: str, updates: str) -> str:
     Returns:
         Success or error message
     """
-    if not FIRESTORE_AVAILABLE:
+    db, firestore = _get_firestore()
+    if db is None:
         return "Error: Firestore database is not available."
-    
+
     try:
         print(f"\n🤖 Updating campaign {campaign_id}...")
         
         # Parse updates
-        update_data = json.loads(updates)
-        update_data["updatedAt"] = datetime.utcnow()
+        update_data = json_fast.loads(updates)
+        update_data["updatedAt"] = firestore.SERVER_TIMESTAMP
         
         # Update document
-        db.collection("campaigns").document(campaign_id).update(update_data)
-        
+        await db.collection("campaigns").document(campaign_id).update(update_data)
+        _fetch_cache.clear()
+
         success_msg = f"✅ Successfully updated campaign {campaign_id}"
         print(f"   - {success_msg}")
         return success_msg
@@ -320,7 +534,7 @@ def update_campaign_tool(campaign_id: str, updates: str) -> str:
         print(f"   - {error_msg}")
         return error_msg
 
-def create_bid_tool(campaign_id: str, bidder_name: str, bid_amount: str, contact_info: str) -> str:
+async def create_bid_tool(campaign_id: str, bidder_name: str, bid_amount: str, contact_info: str) -> str:
     """
     Creates a new bid for a campaign.
     
@@ -333,9 +547,10 @@ def create_bid_tool(campaign_id: str, bidder_name: str, bid_amount: str, contact
     Returns:
         Success message with bid ID or error message
     """
-    if not FIRESTORE_AVAILABLE:
+    db, firestore = _get_firestore()
+    if db is None:
         return "Error: Firestore database is not available."
-    
+
     try:
         print(f"\n🤖 Creating bid for campaign {campaign_id}...")
         
@@ -346,20 +561,23 @@ def create_bid_tool(campaign_id: str, bidder_name: str, bid_amount: str, contact
             "bidAmount": bid_amount,
             "contactInfo": contact_info,
             "status": "active",
-            "createdAt": datetime.utcnow()
+            "createdAt": firestore.SERVER_TIMESTAMP
         }
         
-        # Create bid document
-        _, doc_ref = db.collection("bids").add(bid_data)
-        
-        # Update campaign's bid count and current bid if higher
-        campaign_ref = db.collection("campaigns").document(campaign_id)
-        campaign_ref.update({
+        # Commit the bid and the campaign counter bump in one atomic RPC
+        # instead of two sequential round-trips
+        batch = db.batch()
+        bid_ref = db.collection("bids").document()  # pre-allocated ID
+        batch.set(bid_ref, bid_data)
+        batch.update(db.collection("campaigns").document(campaign_id), {
             "totalBids": firestore.Increment(1),
-            "updatedAt": datetime.utcnow()
+            "updatedAt": firestore.SERVER_TIMESTAMP
         })
-        
-        success_msg = f"✅ Successfully created bid with ID: {doc_ref.id}"
+        await batch.commit()
+
+        _fetch_cache.clear()
+
+        success_msg = f"✅ Successfully created bid with ID: {bid_ref.id}"
         print(f"   - {success_msg}")
         return success_msg
         
@@ -369,352 +587,403 @@ def create_bid_tool(campaign_id: str, bidder_name: str, bid_amount: str, contact
         return error_msg
 
 # --- ML Helper Functions ---
+# Thread-local scratch row for the crop model features (concurrent tool
+# calls each get their own buffer, so no locking is needed)
+_rf_feat_local = threading.local()
+
 def predict_top_3_crops_with_rf(N, P, K, temp, humidity, ph, rainfall):
     """Uses RandomForest model to predict top 3 most likely crops."""
     if not CROP_MODEL_LOADED:
         return ["wheat", "rice", "corn"]  # fallback
-    
-    input_data = np.array([[N, P, K, temp, humidity, ph, rainfall]])
-    probabilities = crop_model.predict_proba(input_data)[0]
-    top_3_indices = np.argsort(probabilities)[-3:][::-1]
-    top_3_crops = crop_model.classes_[top_3_indices]
+
+    # Quantize the soil/weather features so nearby readings share a cache slot
+    cache_key = tuple(round(float(v), 2) for v in (N, P, K, temp, humidity, ph, rainfall))
+    with _prediction_cache_lock:
+        cached = _crop_prediction_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Reuse a per-thread (1, 7) feature row instead of allocating one per call
+    input_data = getattr(_rf_feat_local, "buf", None)
+    if input_data is None:
+        input_data = _rf_feat_local.buf = np.empty((1, 7), dtype=np.float32)
+    input_data[0, :] = (N, P, K, temp, humidity, ph, rainfall)
+
+    if crop_session is not None:
+        # ONNX path: native tree traversal, no sklearn per-call overhead
+        input_name = crop_session.get_inputs()[0].name
+        probabilities = crop_session.run(None, {input_name: input_data})[1][0]
+    else:
+        probabilities = crop_model.predict_proba(input_data)[0]
+    # O(C) partition for the top 3, then sort just those three by probability
+    top_3_indices = np.argpartition(probabilities, -3)[-3:]
+    top_3_indices = top_3_indices[np.argsort(-probabilities[top_3_indices])]
+    top_3_crops = crop_classes[top_3_indices]
+    with _prediction_cache_lock:
+        _crop_prediction_cache[cache_key] = top_3_crops
     return top_3_crops
 
+# Small shared pool for blocking I/O (weather lookups today; any future
+# external fetches should go through it rather than stalling the tool).
+_io_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="agri-io")
+
+_weather_cache = TTLCache(maxsize=128, ttl=900)
+
 def get_weather_data(location="Default"):
-    """Returns placeholder weather data."""
-    return {"temperature": 27.5, "humidity": 75.0, "rainfall": 120.0}
+    """Returns weather data for a location, memoized for 15 minutes."""
+    # Runs on _io_executor threads, so the cache takes the shared lock
+    with _prediction_cache_lock:
+        cached = _weather_cache.get(location)
+    if cached is not None:
+        return cached
+    # Placeholder values until a live weather API is wired in; the cache and
+    # executor hand-off already match what a real network fetch needs.
+    weather = {"temperature": 27.5, "humidity": 75.0, "rainfall": 120.0}
+    with _prediction_cache_lock:
+        _weather_cache[location] = weather
+    return weather
+
+# Base64 payloads are plain ASCII from this alphabet; a cheap regex probe on
+# the first few bytes replaces the old per-request set() arithmetic.
+_BASE64_RE = re.compile(rb"[A-Za-z0-9+/=\s]+")
+
+# Magic numbers for the image formats we accept; payloads starting with one
+# of these are raw bytes and skip the base64 probe/decode entirely.
+_IMAGE_MAGIC = (b'\xff\xd8\xff', b'\x89PNG', b'GIF8', b'RIFF', b'BM')
+
+# Optional SIMD base64: pybase64 decodes multi-MB phone photos several
+# times faster than the stdlib's scalar decoder. Same API either way.
+try:
+    import pybase64 as _b64
+except ImportError:
+    _b64 = base64
+
+def _maybe_b64_decode(raw_data):
+    """
+    Normalizes inline data to raw image bytes.
+    Accepts base64 strings, base64-encoded bytes, or raw image bytes.
+    """
+    if isinstance(raw_data, str):
+        try:
+            return _b64.b64decode(raw_data)
+        except Exception as e:
+            logger.warning("Error decoding base64 string: %s", e)
+            return None
+    if isinstance(raw_data, (bytes, bytearray)):
+        # Raw image bytes announce themselves with a magic number - pass
+        # them straight through without any base64 work
+        prefix = bytes(raw_data[:4])
+        if prefix.startswith(_IMAGE_MAGIC):
+            return bytes(raw_data)
+        # Probe a small prefix: raw image bytes contain non-base64 characters
+        # within the first few bytes (magic numbers, binary headers)
+        if _BASE64_RE.fullmatch(bytes(raw_data[:32])):
+            try:
+                return _b64.b64decode(raw_data)
+            except binascii.Error:
+                pass  # looked like base64 but wasn't - treat as raw bytes
+        return bytes(raw_data)
+    logger.warning("Unexpected data type: %s", type(raw_data))
+    return None
+
+# Optional libjpeg-turbo decoder: SIMD IDCT/color-convert kernels decode
+# field photos 2-3x faster than stock libjpeg. Falls back to PIL when the
+# library isn't installed. (GPU-side nvJPEG decode was considered but the
+# inference path here is CPU TFLite/XLA with no CUDA dependency, so the
+# decoded tensor could not stay on-device anyway.)
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    _turbo_jpeg = TurboJPEG()
+except Exception:
+    _turbo_jpeg = None
+
+# Reusable per-thread preprocessing buffer - skips the two ~600 KB
+# allocations (uint8->float32 cast, then divide) that astype/divide would
+# make on every image. Thread-local keeps concurrent tool calls safe.
+_img_buf_local = threading.local()
+
+# Optional OpenCV resize: cv2.resize runs SIMD-vectorized kernels and
+# INTER_AREA anti-aliases downscales properly; PIL remains the fallback.
+try:
+    import cv2 as _cv2
+except ImportError:
+    _cv2 = None
 
-def load_and_preprocess_image(image_path, target_size=(224, 224)):
-    """Preprocess image for disease classification."""
+def decode_to_array(image_bytes, target_size=(224, 224)):
+    """Decode image bytes in memory and preprocess for disease classification."""
     try:
         from PIL import Image
-        
-        # First, verify the file exists and has content
-        if not os.path.exists(image_path):
-            print(f"Error: Image file does not exist: {image_path}")
-            return None
-            
-        file_size = os.path.getsize(image_path)
-        if file_size == 0:
-            print(f"Error: Image file is empty: {image_path}")
+
+        if not image_bytes:
+            logger.warning("No image data to decode")
             return None
-            
-        print(f"Loading image: {image_path} (size: {file_size} bytes)")
-        
-        # Try to open and process the image
-        try:
-            img = Image.open(image_path)
-            print(f"Image opened successfully: {img.format}, {img.mode}, {img.size}")
-            
-            # Convert to RGB if necessary
+
+        if _turbo_jpeg is not None and image_bytes[:3] == b'\xff\xd8\xff':
+            # JPEG fast path through libjpeg-turbo; pick the largest DCT
+            # scaling denominator that still leaves >= target resolution so
+            # multi-megapixel photos skip most of the IDCT work
+            width, height, _, _ = _turbo_jpeg.decode_header(image_bytes)
+            scaling_factor = (1, 1)
+            for denom in (8, 4, 2):
+                if min(width, height) // denom >= min(target_size):
+                    scaling_factor = (1, denom)
+                    break
+            rgb = _turbo_jpeg.decode(
+                image_bytes, pixel_format=TJPF_RGB, scaling_factor=scaling_factor
+            )
+        else:
+            img = Image.open(io.BytesIO(image_bytes))
+            if img.format == 'JPEG':
+                # draft() pushes the same DCT scaling into stock libjpeg
+                img.draft('RGB', target_size)
+            logger.debug("Image opened: %s, %s, %s", img.format, img.mode, img.size)
             if img.mode != 'RGB':
-                print(f"Converting image from {img.mode} to RGB")
                 img = img.convert('RGB')
-            
-            # Resize the image
-            img = img.resize(target_size)
-            print(f"Image resized to: {img.size}")
-            
-            # Convert to numpy array
-            img_array = np.array(img)
-            print(f"Image array shape: {img_array.shape}")
-            
-            # Add batch dimension
-            img_array = np.expand_dims(img_array, axis=0)
-            
-            # Normalize pixel values to [0, 1]
-            img_array = img_array.astype('float32') / 255.0
-            
-            print(f"Final preprocessed array shape: {img_array.shape}")
-            return img_array
-            
-        except Exception as img_error:
-            print(f"PIL Error opening image: {img_error}")
-            
-            # Try alternative approach - check if it's a valid image file
-            try:
-                with open(image_path, 'rb') as f:
-                    header = f.read(20)
-                    print(f"File header (first 20 bytes): {header}")
-                    
-                # Check for common image signatures
-                if header.startswith(b'\xff\xd8\xff'):
-                    print("File appears to be JPEG")
-                elif header.startswith(b'\x89PNG\r\n\x1a\n'):
-                    print("File appears to be PNG")
-                elif header.startswith(b'RIFF') and b'WEBP' in header:
-                    print("File appears to be WEBP")
-                else:
-                    print(f"Unrecognized file format. Header: {header[:10]}")
-                    
-            except Exception as check_error:
-                print(f"Error checking file format: {check_error}")
-                
-            return None
-            
+            rgb = np.asarray(img)
+
+        if rgb.shape[:2] != target_size:
+            if _cv2 is not None:
+                rgb = _cv2.resize(rgb, target_size, interpolation=_cv2.INTER_AREA)
+            else:
+                # BILINEAR is ~2x cheaper than Pillow's default BICUBIC and
+                # makes no difference to a 224x224 CNN classifier
+                rgb = np.asarray(Image.fromarray(rgb).resize(target_size, Image.BILINEAR))
+
+        # Normalize to [0, 1] float32 into the preallocated batch-of-1 buffer;
+        # the multiply fuses the uint8->float32 cast with the scaling pass
+        buf = getattr(_img_buf_local, 'buf', None)
+        if buf is None or buf.shape[1:3] != target_size:
+            buf = _img_buf_local.buf = np.empty((1,) + target_size + (3,), np.float32)
+        np.multiply(rgb, np.float32(1.0 / 255.0), out=buf[0], casting="unsafe")
+        return buf
+
     except ImportError:
-        print("Error: PIL (Pillow) is not installed. Please install with: pip install Pillow")
+        logger.error("PIL (Pillow) is not installed. Please install with: pip install Pillow")
         return None
     except Exception as e:
-        print(f"Error preprocessing image: {e}")
+        logger.warning("Error preprocessing image: %s", e)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Image header (first 20 bytes): %s", image_bytes[:20])
         return None
 
-def predict_image_class(model, image_path, class_indices_map):
-    """Predict disease class from image."""
+def predict_image_class(image_bytes, class_names):
+    """Predict disease class from raw image bytes."""
     try:
-        print(f"Starting prediction for image: {image_path}")
-        
-        preprocessed_img = load_and_preprocess_image(image_path)
+        image_key = hashlib.sha1(image_bytes).digest()
+        with _prediction_cache_lock:
+            cached = _image_prediction_cache.get(image_key)
+        if cached is not None:
+            logger.debug("Returning cached prediction for image")
+            return cached
+
+        preprocessed_img = decode_to_array(image_bytes)
         if preprocessed_img is None:
             return "Error processing image - preprocessing failed"
-        
-        print("Making prediction with model...")
-        predictions = model.predict(preprocessed_img, verbose=0)
-        print(f"Prediction shape: {predictions.shape}")
-        print(f"Prediction values: {predictions[0][:5]}...")  # Show first 5 values
-        
+
+        phash_key = None
+        if imagehash is not None:
+            from PIL import Image
+            thumb = Image.fromarray((preprocessed_img[0] * 255.0).astype(np.uint8))
+            phash_key = str(imagehash.phash(thumb))
+            with _prediction_cache_lock:
+                cached = _phash_prediction_cache.get(phash_key)
+                if cached is not None:
+                    _image_prediction_cache[image_key] = cached
+            if cached is not None:
+                logger.debug("Perceptual-hash cache hit for image")
+                return cached
+
+        predictions = _disease_batcher.submit(preprocessed_img)
+
         predicted_class_index = np.argmax(predictions, axis=1)[0]
         confidence = np.max(predictions, axis=1)[0]
-        
-        print(f"Predicted class index: {predicted_class_index}")
-        print(f"Confidence: {confidence:.4f}")
-        
-        if str(predicted_class_index) not in class_indices_map:
-            print(f"Warning: Class index {predicted_class_index} not found in class_indices_map")
-            print(f"Available indices: {list(class_indices_map.keys())[:10]}...")  # Show first 10
+        logger.debug("Predicted class index %s with confidence %.4f",
+                     predicted_class_index, confidence)
+
+        if not 0 <= predicted_class_index < len(class_names) or class_names[predicted_class_index] is None:
+            logger.warning("Class index %s not found in class names", predicted_class_index)
             return f"Error: Unknown class index {predicted_class_index}"
-        
-        class_name = class_indices_map[str(predicted_class_index)]
-        print(f"Predicted class: {class_name}")
-        
+
+        class_name = class_names[predicted_class_index]
+        logger.debug("Predicted class: %s", class_name)
+
+        with _prediction_cache_lock:
+            _image_prediction_cache[image_key] = class_name
+            if phash_key is not None:
+                _phash_prediction_cache[phash_key] = class_name
         return class_name
-        
+
     except Exception as e:
-        print(f"Error in predict_image_class: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in predict_image_class")
         return f"Error processing image: {str(e)}"
 
-def save_image_from_tool_context(tool_context):
+def predict_image_classes(images_bytes, class_names):
     """
-    Extract and save image from ToolContext to a temporary file.
-    Returns the temporary file path or None if no image found.
+    Predict disease classes for several images in one batched model call.
+    Returns a list of class names (or error strings) in input order.
     """
-    if hasattr(tool_context, 'user_content') and tool_context.user_content and tool_context.user_content.parts:
-        for part in tool_context.user_content.parts:
-            if hasattr(part, 'inline_data') and part.inline_data:
-                try:
-                    # Get the base64 data - it might already be decoded bytes or still be a string
-                    raw_data = part.inline_data.data
-                    
-                    # Check if it's already bytes or if it's a base64 string
-                    if isinstance(raw_data, str):
-                        print(f"Data is string, decoding from base64. Length: {len(raw_data)}")
-                        image_data = base64.b64decode(raw_data)
-                    elif isinstance(raw_data, bytes):
-                        print(f"Data is bytes. Length: {len(raw_data)}")
-                        
-                        # Check if the bytes represent base64 data vs raw image data
-                        # Base64 uses only A-Z, a-z, 0-9, +, /, = characters
-                        # Let's check if first 100 bytes are printable ASCII (base64 pattern)
-                        sample = raw_data[:100]
-                        try:
-                            sample_str = sample.decode('utf-8')
-                            # Check if it looks like base64 (mostly alphanumeric + few special chars)
-                            base64_chars = set('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=')
-                            sample_chars = set(sample_str)
-                            
-                            # If most characters are base64 characters, it's likely base64
-                            if len(sample_chars - base64_chars) <= 2:  # Allow 2 non-base64 chars for tolerance
-                                print("Data appears to be base64 string in bytes format")
-                                try:
-                                    decoded_test = base64.b64decode(raw_data.decode('utf-8'))
-                                    print(f"Base64 decode successful: {len(decoded_test)} bytes")
-                                    image_data = decoded_test
-                                except Exception as decode_error:
-                                    print(f"Base64 decode failed: {decode_error}")
-                                    print("Treating as raw bytes")
-                                    image_data = raw_data
-                            else:
-                                print("Data appears to be raw image bytes")
-                                image_data = raw_data
-                        except UnicodeDecodeError:
-                            print("Data contains non-UTF8 bytes, treating as raw image data")
-                            image_data = raw_data
-                    else:
-                        print(f"Unexpected data type: {type(raw_data)}")
-                        continue
-                    
-                    print(f"Final image data size: {len(image_data)} bytes")
-                    
-                    # Check if we have reasonable image data size
-                    if len(image_data) < 100:
-                        print(f"Warning: Image data seems too small ({len(image_data)} bytes)")
-                        print(f"First 20 bytes: {image_data[:20]}")
-                        return None
-                    
-                    # Determine file extension from mime type if available
-                    file_extension = '.jpg'  # default
-                    if hasattr(part.inline_data, 'mime_type'):
-                        mime_type = part.inline_data.mime_type
-                        if 'png' in mime_type.lower():
-                            file_extension = '.png'
-                        elif 'jpeg' in mime_type.lower() or 'jpg' in mime_type.lower():
-                            file_extension = '.jpg'
-                        elif 'webp' in mime_type.lower():
-                            file_extension = '.webp'
-                    
-                    # Check image format by header
-                    if image_data.startswith(b'\x89PNG\r\n\x1a\n'):
-                        print("Detected PNG format from header")
-                        file_extension = '.png'
-                    elif image_data.startswith(b'\xff\xd8\xff'):
-                        print("Detected JPEG format from header")
-                        file_extension = '.jpg'
-                    elif image_data.startswith(b'RIFF') and b'WEBP' in image_data[:20]:
-                        print("Detected WEBP format from header")
-                        file_extension = '.webp'
-                    else:
-                        print(f"Warning: Unknown image format. Header: {image_data[:20]}")
-                    
-                    # Create temporary file with proper extension
-                    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=file_extension)
-                    temp_file.write(image_data)
-                    temp_file.close()
-                    
-                    # Verify the file was written correctly
-                    written_size = os.path.getsize(temp_file.name)
-                    if written_size == 0:
-                        print("Error: Image file is empty after writing")
-                        os.unlink(temp_file.name)
-                        return None
-                    elif written_size != len(image_data):
-                        print(f"Warning: File size mismatch. Expected: {len(image_data)}, Written: {written_size}")
-                    
-                    print(f"Image saved to: {temp_file.name}, size: {written_size} bytes")
-                    return temp_file.name
-                    
-                except Exception as e:
-                    print(f"Error saving image: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    return None
+    results = [None] * len(images_bytes)
+    to_decode = []
+    for i, image_bytes in enumerate(images_bytes):
+        image_key = hashlib.sha1(image_bytes).digest()
+        with _prediction_cache_lock:
+            cached = _image_prediction_cache.get(image_key)
+        if cached is not None:
+            results[i] = cached
+            continue
+        to_decode.append((i, image_key, image_bytes))
+
+    def _decode_copy(image_bytes):
+        # Copy out of the shared thread-local buffer: a pool thread reuses
+        # its buffer for the next image it decodes
+        arr = decode_to_array(image_bytes)
+        return None if arr is None else np.array(arr, copy=True)
+
+    if len(to_decode) > 1:
+        # libjpeg-turbo and PIL release the GIL while decoding, so cache
+        # misses decode in parallel before one batched model call
+        with ThreadPoolExecutor(max_workers=min(4, len(to_decode))) as executor:
+            decoded = list(executor.map(_decode_copy, (item[2] for item in to_decode)))
+    else:
+        decoded = [_decode_copy(item[2]) for item in to_decode]
+
+    pending = []
+    for (i, image_key, _), arr in zip(to_decode, decoded):
+        if arr is None:
+            results[i] = "Error processing image - preprocessing failed"
+            continue
+        # The batcher worker coalesces these into one model call
+        pending.append((i, image_key, _disease_batcher.submit_async(arr)))
+
+    for i, image_key, future in pending:
+        try:
+            predictions = future.result()
+            predicted_class_index = int(np.argmax(predictions, axis=1)[0])
+            if 0 <= predicted_class_index < len(class_names) and class_names[predicted_class_index] is not None:
+                class_name = class_names[predicted_class_index]
+                with _prediction_cache_lock:
+                    _image_prediction_cache[image_key] = class_name
+                results[i] = class_name
+            else:
+                results[i] = f"Error: Unknown class index {predicted_class_index}"
+        except Exception as e:
+            results[i] = f"Error processing image: {str(e)}"
+    return results
+
+def extract_image_bytes_from_part(part):
+    """
+    Extract raw image bytes from a single ToolContext part.
+    Returns decoded bytes or None if the part holds no usable image.
+    """
+    if hasattr(part, 'inline_data') and part.inline_data:
+        try:
+            image_data = _maybe_b64_decode(part.inline_data.data)
+            if image_data is None:
+                return None
+
+            if len(image_data) < 100:
+                logger.warning("Image data seems too small (%d bytes)", len(image_data))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("First 20 bytes: %s", image_data[:20])
+                return None
+
+            return image_data
+
+        except Exception:
+            logger.exception("Error extracting image bytes")
+            return None
     return None
 
+@dataclass(slots=True)
+class MultimodalContent:
+    """Fixed-shape container for content extracted from a ToolContext.
+
+    Slots keep per-request containers compact and make attribute access a
+    direct slot read instead of a dict lookup.
+    """
+    text: list = field(default_factory=list)
+    images: list = field(default_factory=list)
+    audio: list = field(default_factory=list)
+    has_voice: bool = False
+
+# Long-edge cap for images retained in session content; anything larger
+# only adds bytes on the wire and Gemini vision tokens, not accuracy.
+_LLM_IMAGE_MAX_EDGE = 1024
+
+def shrink_image_for_llm(image_bytes, max_edge=_LLM_IMAGE_MAX_EDGE):
+    """Downscales oversized photos and re-encodes as JPEG q=85.
+
+    Phone uploads are commonly 3-12 MP; both the local classifier and
+    Gemini vision work from far fewer pixels, so shipping the original
+    just wastes bandwidth and token budget. Images already within the
+    cap (or that fail to decode) are returned unchanged.
+    """
+    try:
+        from PIL import Image
+
+        img = Image.open(io.BytesIO(image_bytes))
+        if max(img.size) <= max_edge:
+            return image_bytes
+        img.draft('RGB', (max_edge, max_edge))
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        img.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        out = io.BytesIO()
+        img.save(out, 'JPEG', quality=85, optimize=True)
+        shrunk = out.getvalue()
+        logger.debug("Shrunk image %d -> %d bytes", len(image_bytes), len(shrunk))
+        return shrunk
+    except Exception as e:
+        logger.warning("Could not shrink image, keeping original: %s", e)
+        return image_bytes
+
 def extract_multimodal_content(tool_context):
     """
     Extract text, images, and audio from ToolContext for multimodal processing.
-    Returns a dictionary with extracted content types.
+    Returns a MultimodalContent with the extracted content types.
     """
-    content = {
-        'text': [],
-        'images': [],
-        'audio': [],
-        'has_voice': False
-    }
+    content = MultimodalContent()
     
     if hasattr(tool_context, 'user_content') and tool_context.user_content and tool_context.user_content.parts:
-        print(f"Processing {len(tool_context.user_content.parts)} content parts...")
-        
+        logger.debug("Processing %d content parts...", len(tool_context.user_content.parts))
+
         for i, part in enumerate(tool_context.user_content.parts):
-            print(f"Part {i}: {type(part)}")
-            
             # Extract text content
             if hasattr(part, 'text') and part.text is not None:
-                content['text'].append(part.text)
-                print(f"  - Text: {part.text[:100]}...")
-            
+                content.text.append(part.text)
+                logger.debug("Part %d text: %.100s...", i, part.text)
+
             # Extract inline data (images, audio, etc.)
             if hasattr(part, 'inline_data') and part.inline_data:
                 mime_type = getattr(part.inline_data, 'mime_type', 'unknown')
                 data_size = len(getattr(part.inline_data, 'data', ''))
-                print(f"  - Inline data: {mime_type}, {data_size} bytes")
+                logger.debug("Part %d inline data: %s, %d bytes", i, mime_type, data_size)
                 
                 # Handle image data
                 if 'image' in mime_type.lower():
-                    image_path = save_image_from_tool_context_part(part)
-                    if image_path:
-                        content['images'].append({
-                            'path': image_path,
+                    image_bytes = extract_image_bytes_from_part(part)
+                    if image_bytes:
+                        image_bytes = shrink_image_for_llm(image_bytes)
+                        content.images.append({
+                            'data': image_bytes,
                             'mime_type': mime_type,
-                            'size': data_size
+                            'size': len(image_bytes)
                         })
                 
                 # Handle audio data (voice input)
                 elif 'audio' in mime_type.lower():
-                    content['has_voice'] = True
-                    content['audio'].append({
+                    content.has_voice = True
+                    content.audio.append({
                         'mime_type': mime_type,
                         'size': data_size,
                         'data': part.inline_data.data
                     })
-                    print(f"  - Voice input detected: {mime_type}")
+                    logger.debug("Voice input detected: %s", mime_type)
     
     return content
 
-def save_image_from_tool_context_part(part):
-    """
-    Extract and save image from a single ToolContext part.
-    Helper function for multimodal content extraction.
-    """
-    if hasattr(part, 'inline_data') and part.inline_data:
-        try:
-            # Use the same logic as save_image_from_tool_context but for a single part
-            raw_data = part.inline_data.data
-            
-            if isinstance(raw_data, str):
-                image_data = base64.b64decode(raw_data)
-            elif isinstance(raw_data, bytes):
-                sample = raw_data[:100]
-                try:
-                    sample_str = sample.decode('utf-8')
-                    base64_chars = set('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=')
-                    sample_chars = set(sample_str)
-                    
-                    if len(sample_chars - base64_chars) <= 2:
-                        try:
-                            decoded_test = base64.b64decode(raw_data.decode('utf-8'))
-                            image_data = decoded_test
-                        except:
-                            image_data = raw_data
-                    else:
-                        image_data = raw_data
-                except UnicodeDecodeError:
-                    image_data = raw_data
-            else:
-                return None
-            
-            if len(image_data) < 100:
-                return None
-            
-            # Determine file extension
-            file_extension = '.jpg'
-            if hasattr(part.inline_data, 'mime_type'):
-                mime_type = part.inline_data.mime_type
-                if 'png' in mime_type.lower():
-                    file_extension = '.png'
-                elif 'jpeg' in mime_type.lower() or 'jpg' in mime_type.lower():
-                    file_extension = '.jpg'
-                elif 'webp' in mime_type.lower():
-                    file_extension = '.webp'
-            
-            # Create temporary file
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=file_extension)
-            temp_file.write(image_data)
-            temp_file.close()
-            
-            return temp_file.name
-            
-        except Exception as e:
-            print(f"Error saving image from part: {e}")
-            return None
-    return None
-
-def generate_disease_explanation(disease_name):
-    """
-    Generate detailed explanation for a disease using basic explanation.
-    ADK sub-agents will handle detailed explanations through the disease_explanation_agent.
-    """
+def _render_disease_explanation(disease_name):
+    """Renders the static markdown explanation for one disease class."""
     # Basic explanation without external LLM (ADK agent will handle detailed explanations)
     clean_disease_name = disease_name.replace('___', ' ').replace('_', ' ')
     
@@ -768,8 +1037,56 @@ This appears to be a plant disease that requires attention and proper treatment.
 **Important:** For severe infections or if symptoms persist, consult with local agricultural experts or plant pathologists for specific treatment recommendations.
 """
 
+# Human-readable class names, normalized once instead of running two
+# str.replace passes on every prediction result
+_PRETTY_CLASS_NAMES = (
+    {name: name.replace('___', ' ').replace('_', ' ') for name in CLASS_NAMES if name}
+    if CLASS_NAMES else {}
+)
+
+def _pretty_class_name(raw_name):
+    """Maps a raw class label to its display form (precomputed for known labels)."""
+    pretty = _PRETTY_CLASS_NAMES.get(raw_name)
+    if pretty is None:
+        pretty = raw_name.replace('___', ' ').replace('_', ' ')
+    return pretty
+
+# The class label set is known at load time, so every explanation can be
+# rendered once up front; per-request work collapses to a dict lookup.
+_EXPLANATION_CACHE = (
+    {name: _render_disease_explanation(name) for name in CLASS_NAMES if name}
+    if CLASS_NAMES else {}
+)
+
+def generate_disease_explanation(disease_name):
+    """
+    Generate detailed explanation for a disease using basic explanation.
+    ADK sub-agents will handle detailed explanations through the disease_explanation_agent.
+    Known class names hit the precomputed cache; anything else renders on demand.
+    """
+    explanation = _EXPLANATION_CACHE.get(disease_name)
+    if explanation is None:
+        explanation = _render_disease_explanation(disease_name)
+    return explanation
+
+async def get_disease_explanation_async(disease_name):
+    """
+    Cache-first async explanation lookup for the analyzer hot path.
+
+    Known labels resolve to the precomputed markdown without leaving the
+    event loop; misses render off-loop and backfill the cache, so the
+    first request for a new label pays the cost once. When explanations
+    become LLM-backed via disease_explanation_agent, only this fallback
+    branch needs to change.
+    """
+    explanation = _EXPLANATION_CACHE.get(disease_name)
+    if explanation is None:
+        explanation = await asyncio.to_thread(_render_disease_explanation, disease_name)
+        _EXPLANATION_CACHE[disease_name] = explanation
+    return explanation
+
 # --- Enhanced Farming Tools with ML Integration ---
-def ai_crop_planner_tool(N: int, P: int, K: int, ph: float, area_in_acres: float, location: str = "Default") -> str:
+async def ai_crop_planner_tool(N: int, P: int, K: int, ph: float, area_in_acres: float, location: str = "Default") -> str:
     """
     AI-powered crop recommendation based on soil conditions and weather.
     
@@ -784,15 +1101,19 @@ def ai_crop_planner_tool(N: int, P: int, K: int, ph: float, area_in_acres: float
     Returns:
         Top 3 crop recommendations with rationale
     """
-    print(f"\n🤖 Running AI Crop Planner for {area_in_acres} acres...")
+    logger.debug("Running AI Crop Planner for %s acres", area_in_acres)
     
-    # Get weather data
-    weather = get_weather_data(location)
+    # Kick the (potentially remote) weather fetch off-thread so it overlaps
+    # with the soil-condition branching below instead of serializing with it
+    loop = asyncio.get_running_loop()
+    weather_future = loop.run_in_executor(_io_executor, get_weather_data, location)
     
     if CROP_MODEL_LOADED:
         # Use ML model for recommendations
-        recommended_crops = predict_top_3_crops_with_rf(
-            N, P, K, weather['temperature'], weather['humidity'], ph, weather['rainfall']
+        weather = await weather_future
+        recommended_crops = await asyncio.to_thread(
+            predict_top_3_crops_with_rf,
+            N, P, K, weather['temperature'], weather['humidity'], ph, weather['rainfall'],
         )
         confidence_msg = "Based on AI analysis of your soil and weather conditions"
     else:
@@ -804,39 +1125,17 @@ def ai_crop_planner_tool(N: int, P: int, K: int, ph: float, area_in_acres: float
         else:
             recommended_crops = ["wheat", "rice", "corn"]
         confidence_msg = "Based on general soil condition analysis (ML model not available)"
-    
-    return f"""
-## AI Crop Recommendations for {area_in_acres} acres
-
-**Soil Analysis:**
-- Nitrogen: {N} kg/ha
-- Phosphorus: {P} kg/ha  
-- Potassium: {K} kg/ha
-- pH: {ph}
-- Location: {location}
-
-**Weather Conditions:**
-- Temperature: {weather['temperature']}°C
-- Humidity: {weather['humidity']}%
-- Expected Rainfall: {weather['rainfall']}mm
-
-**Top 3 Recommended Crops:**
-{confidence_msg}:
-
-1. **{recommended_crops[0].title()}** - Primary recommendation
-2. **{recommended_crops[1].title()}** - Secondary option  
-3. **{recommended_crops[2].title()}** - Alternative choice
-
-**Next Steps:**
-- Select one of these crops for detailed financial planning
-- Consider local market demand and prices
-- Check seed availability and planting season
-- Consult with local agricultural extension officer
-
-Would you like me to create a detailed financial plan for any of these crops?
-"""
+        weather = await weather_future
+    
+    return _CROP_PLAN_REPORT_TMPL.format(
+        area_in_acres=area_in_acres, N=N, P=P, K=K, ph=ph, location=location,
+        temperature=weather['temperature'], humidity=weather['humidity'],
+        rainfall=weather['rainfall'], confidence_msg=confidence_msg,
+        crop_1=recommended_crops[0].title(), crop_2=recommended_crops[1].title(),
+        crop_3=recommended_crops[2].title(),
+    )
 
-def crop_health_analyzer_tool(tool_context) -> str:
+async def crop_health_analyzer_tool(tool_context) -> str:
     """
     Analyzes crop image to detect diseases using AI.
     Supports text, image, and voice input for comprehensive farmer assistance.
@@ -856,16 +1155,16 @@ def crop_health_analyzer_tool(tool_context) -> str:
     content = extract_multimodal_content(tool_context)
     
     # Check for voice input
-    if content['has_voice']:
-        print(f"🎤 Voice input detected with {len(content['audio'])} audio parts")
+    if content.has_voice:
+        print(f"🎤 Voice input detected with {len(content.audio)} audio parts")
         voice_prompt = "\n**Note:** Voice input received - you can ask questions about your crops in any language!"
     else:
         voice_prompt = ""
     
     # Check for images
-    if not content['images']:
+    if not content.images:
         print("⚠️ No image found in content.")
-        combined_text = ' '.join(content['text']) if content['text'] else ""
+        combined_text = ' '.join(content.text) if content.text else ""
         
         # If there's text content, provide general guidance
         if combined_text.strip():
@@ -920,41 +1219,42 @@ Please upload an image of your crop or plant for disease analysis. I can help id
 I'll provide detailed diagnosis and treatment recommendations!
 """
     
-    # Process the first image
-    image_info = content['images'][0]
-    image_path = image_info['path']
-    
-    print(f"🖼️ Processing image: {image_path} ({image_info['size']} bytes)")
-    
-    # If there are multiple images, mention them
-    if len(content['images']) > 1:
-        print(f"📸 Additional images detected: {len(content['images']) - 1}")
-        multi_image_note = f"\n**Note:** {len(content['images'])} images received. Analyzing the first image."
-    else:
-        multi_image_note = ""
-    
-    if not os.path.exists(image_path):
-        return f"Error: The file path '{image_path}' does not exist."
-    
+    image_info = content.images[0]
+    print(f"🖼️ Processing image: {image_info['mime_type']} ({image_info['size']} bytes)")
+
     try:
-        print(f"Analyzing image at: {image_path}")
-        # Use ML model to predict disease
-        prediction = predict_image_class(disease_model, image_path, class_indices)
-        disease_name = prediction.replace('___', ' ').replace('_', ' ')
+        if len(content.images) > 1:
+            # Multi-angle uploads: classify every image through one batched
+            # model call instead of silently dropping all but the first
+            print(f"📸 Batch analyzing {len(content.images)} images...")
+            predictions_all = await asyncio.to_thread(
+                predict_image_classes,
+                [info['data'] for info in content.images], CLASS_NAMES,
+            )
+            prediction = predictions_all[0]
+            per_image_lines = "\n".join(
+                f"{i + 1}. {_pretty_class_name(p)}"
+                for i, p in enumerate(predictions_all)
+            )
+            multi_image_note = (
+                f"\n**Note:** {len(content.images)} images analyzed as one batch:\n"
+                f"{per_image_lines}\n\nDetailed analysis below covers the first image."
+            )
+        else:
+            prediction = await asyncio.to_thread(
+                predict_image_class, image_info['data'], CLASS_NAMES
+            )
+            multi_image_note = ""
+
+        disease_name = _pretty_class_name(prediction)
         print(f"   - Model predicted disease: {disease_name}")
-        
-        # Generate detailed explanation using LLM
-        explanation = generate_disease_explanation(prediction)
-        
+
+        # Generate detailed explanation (cache-first, renders off-loop on miss)
+        explanation = await get_disease_explanation_async(prediction)
+
         # Extract any text input along with the image
-        user_text = ' '.join(content['text']) if content['text'] else ""
-        
-        # Clean up temporary file
-        try:
-            os.unlink(image_path)
-        except:
-            pass
-        
+        user_text = ' '.join(content.text) if content.text else ""
+
         return f"""## AI Crop Health Analysis Results{voice_prompt}{multi_image_note}
 
 **� Model Prediction:** {disease_name}
@@ -969,19 +1269,12 @@ I'll provide detailed diagnosis and treatment recommendations!
 - Keep records of treatments applied and their effectiveness
 - Consider environmental factors (weather, soil conditions, recent changes)
 
-{f'**🎤 Voice Support:** You can ask follow-up questions using voice input in Hindi or your preferred language!' if content['has_voice'] else '**💬 Ask Questions:** Feel free to ask follow-up questions about treatment, prevention, or any farming concerns!'}
+{f'**🎤 Voice Support:** You can ask follow-up questions using voice input in Hindi or your preferred language!' if content.has_voice else '**💬 Ask Questions:** Feel free to ask follow-up questions about treatment, prevention, or any farming concerns!'}
 
 **⚠️ Important Note:** This is an AI-based assessment using machine learning. For severe infections, rapid spread, or uncertain cases, please consult with local agricultural experts, extension officers, or plant pathologists for professional diagnosis and treatment recommendations.
 """
         
     except Exception as e:
-        # Clean up temporary file on error
-        try:
-            if image_path:
-                os.unlink(image_path)
-        except:
-            pass
-            
         return f"""
 ## Crop Health Analysis Error
 
@@ -1087,19 +1380,10 @@ I don't have specific data for {crop_type} in {season} season.
     
     return result
 
-def plant_health_diagnostic_tool(symptoms: str, crop_type: str, affected_part: str = "leaves") -> str:
-    """
-    Diagnoses plant health issues based on symptoms and provides treatment recommendations.
-    
-    Args:
-        symptoms: Description of symptoms (e.g., yellowing, spots, wilting)
-        crop_type: Type of crop affected
-        affected_part: Part of plant affected (leaves, stem, roots, fruit)
-    
-    Returns:
-        Diagnosis and treatment recommendations
-    """
-    disease_database = {
+# Static lookup tables for the advisory tools, hoisted to module scope so
+# each call reuses the same frozen mappings instead of rebuilding the
+# literals. MappingProxyType keeps them read-only.
+_DISEASE_DATABASE = MappingProxyType({
         "yellowing": {
             "possible_causes": ["Nitrogen deficiency", "Overwatering", "Root rot", "Viral infection"],
             "treatments": [
@@ -1127,33 +1411,199 @@ def plant_health_diagnostic_tool(symptoms: str, crop_type: str, affected_part: s
                 "Use disease-resistant varieties"
             ]
         }
+})
+
+# Tuple of symptom keywords for the scan loop in plant_health_diagnostic_tool
+_SYMPTOM_KEYS = tuple(_DISEASE_DATABASE)
+
+# Optional Aho-Corasick automaton: matches every symptom keyword in one
+# linear pass over the input, so lookup cost stays flat as the disease
+# database grows. Falls back to the substring scan when unavailable.
+try:
+    import ahocorasick
+    _SYMPTOM_AUTOMATON = ahocorasick.Automaton()
+    for _key in _SYMPTOM_KEYS:
+        _SYMPTOM_AUTOMATON.add_word(_key, _key)
+    _SYMPTOM_AUTOMATON.make_automaton()
+except ImportError:
+    _SYMPTOM_AUTOMATON = None
+
+_NPK_REQUIREMENTS = MappingProxyType({
+    "rice": {"N": 120, "P": 60, "K": 40},
+    "wheat": {"N": 120, "P": 60, "K": 40},
+    "corn": {"N": 150, "P": 75, "K": 50},
+    "tomato": {"N": 150, "P": 75, "K": 50},
+    "potato": {"N": 180, "P": 90, "K": 100},
+    "cotton": {"N": 120, "P": 60, "K": 50}
+})
+
+_DEFAULT_NPK = MappingProxyType({"N": 100, "P": 50, "K": 50})
+
+# Display-cased crop names for the known NPK crops, computed once
+_TITLE_CROPS = MappingProxyType({k: k.title() for k in _NPK_REQUIREMENTS})
+
+# Contract farming quality standards and certifications
+_QUALITY_STANDARDS = MappingProxyType({
+    "A": {"description": "Premium quality", "premium_percent": 15},
+    "B": {"description": "Standard quality", "premium_percent": 5},
+    "C": {"description": "Basic quality", "premium_percent": 0},
+    "Premium": {"description": "Export quality", "premium_percent": 25},
+    "Standard": {"description": "Domestic market quality", "premium_percent": 0}
+})
+
+# Report skeletons shared across calls: the constant markdown body is one
+# interned string formatted with the per-call values, instead of being
+# re-assembled inside each function frame.
+_CROP_PLAN_REPORT_TMPL = """
+## AI Crop Recommendations for {area_in_acres} acres
+
+**Soil Analysis:**
+- Nitrogen: {N} kg/ha
+- Phosphorus: {P} kg/ha  
+- Potassium: {K} kg/ha
+- pH: {ph}
+- Location: {location}
+
+**Weather Conditions:**
+- Temperature: {temperature}°C
+- Humidity: {humidity}%
+- Expected Rainfall: {rainfall}mm
+
+**Top 3 Recommended Crops:**
+{confidence_msg}:
+
+1. **{crop_1}** - Primary recommendation
+2. **{crop_2}** - Secondary option  
+3. **{crop_3}** - Alternative choice
+
+**Next Steps:**
+- Select one of these crops for detailed financial planning
+- Consider local market demand and prices
+- Check seed availability and planting season
+- Consult with local agricultural extension officer
+
+Would you like me to create a detailed financial plan for any of these crops?
+"""
+
+_NPK_REPORT_TMPL = """
+## NPK Management Plan for {crop_title}
+
+**Field Size:** {field_size}
+**Current Soil Status:** {soil_test_report}
+
+### Recommended NPK Application:
+- **Nitrogen (N):** {n} kg/ha
+- **Phosphorus (P₂O₅):** {p} kg/ha  
+- **Potassium (K₂O):** {k} kg/ha
+
+### Application Schedule:
+
+**Basal Application (at sowing):**
+- Full dose of Phosphorus
+- Full dose of Potassium
+- 25% of Nitrogen
+
+**Top Dressing:**
+- 50% of Nitrogen at vegetative stage
+- 25% of Nitrogen at reproductive stage
+
+### Fertilizer Sources:
+- **Nitrogen:** Urea (46% N), Ammonium Sulfate (20% N)
+- **Phosphorus:** DAP (18-46-0), SSP (16% P₂O₅)
+- **Potassium:** MOP (60% K₂O), SOP (50% K₂O)
+
+### Organic Alternatives:
+- **Nitrogen:** Farmyard manure, Compost, Green manure
+- **Phosphorus:** Bone meal, Rock phosphate
+- **Potassium:** Wood ash, Kelp meal
+
+### Application Tips:
+1. Apply fertilizers in the evening or early morning
+2. Ensure adequate soil moisture
+3. Mix fertilizers with soil properly
+4. Avoid over-application to prevent nutrient burn
+5. Consider split application for better efficiency
+
+### Monitoring:
+- Observe plant growth and color
+- Check for nutrient deficiency symptoms
+- Adjust application based on crop response
+- Conduct soil testing annually
+
+**Note:** These are general recommendations. Adjust based on actual soil test results and local conditions.
+"""
+
+# Farming method certifications and buyer preferences
+_FARMING_METHODS = MappingProxyType({
+    "organic": {
+        "certification": "Organic certification required",
+        "buyer_demand": "High",
+        "price_premium": "20-30%",
+        "requirements": ["No synthetic pesticides", "Organic fertilizers only", "3-year transition period"]
+    },
+    "natural": {
+        "certification": "Natural farming practices",
+        "buyer_demand": "Growing",
+        "price_premium": "10-15%",
+        "requirements": ["Minimal external inputs", "Natural pest control", "Soil health focus"]
+    },
+    "conventional": {
+        "certification": "Standard farming practices",
+        "buyer_demand": "Stable",
+        "price_premium": "0%",
+        "requirements": ["Good agricultural practices", "Quality standards compliance"]
+    },
+    "sustainable": {
+        "certification": "Sustainable agriculture certification",
+        "buyer_demand": "Increasing",
+        "price_premium": "5-10%",
+        "requirements": ["Resource conservation", "Biodiversity protection", "Community benefits"]
     }
+})
+
+def plant_health_diagnostic_tool(symptoms: str, crop_type: str, affected_part: str = "leaves") -> str:
+    """
+    Diagnoses plant health issues based on symptoms and provides treatment recommendations.
+    
+    Args:
+        symptoms: Description of symptoms (e.g., yellowing, spots, wilting)
+        crop_type: Type of crop affected
+        affected_part: Part of plant affected (leaves, stem, roots, fruit)
     
+    Returns:
+        Diagnosis and treatment recommendations
+    """
     symptoms_lower = symptoms.lower()
     diagnosis_found = False
     
-    result = f"""
+    parts = [f"""
 ## Plant Health Diagnosis for {crop_type.title()}
 
 **Symptoms:** {symptoms}
 **Affected Part:** {affected_part}
 
 ### Possible Diagnoses:
-"""
+"""]
     
-    for symptom_key, data in disease_database.items():
-        if symptom_key in symptoms_lower:
-            diagnosis_found = True
-            result += f"""
+    if _SYMPTOM_AUTOMATON is not None:
+        matched_keys = {key for _, key in _SYMPTOM_AUTOMATON.iter(symptoms_lower)}
+        matched = [key for key in _SYMPTOM_KEYS if key in matched_keys]
+    else:
+        matched = [key for key in _SYMPTOM_KEYS if key in symptoms_lower]
+
+    for symptom_key in matched:
+        data = _DISEASE_DATABASE[symptom_key]
+        diagnosis_found = True
+        parts.append(f"""
 **{symptom_key.title()} detected:**
 - Possible causes: {', '.join(data['possible_causes'])}
 - Recommended treatments:
-"""
-            for treatment in data['treatments']:
-                result += f"  • {treatment}\n"
+""")
+        for treatment in data['treatments']:
+            parts.append(f"  • {treatment}\n")
     
     if not diagnosis_found:
-        result += """
+        parts.append("""
 Based on the symptoms described, I recommend:
 - Contact your local agricultural extension officer
 - Take clear photos of affected plants
@@ -1166,9 +1616,9 @@ Based on the symptoms described, I recommend:
 - Use disease-resistant varieties
 - Practice crop rotation
 - Regular field monitoring
-"""
+""")
     
-    result += """
+    parts.append("""
 ### When to Seek Professional Help:
 - Symptoms are spreading rapidly
 - Multiple plants are affected
@@ -1176,89 +1626,75 @@ Based on the symptoms described, I recommend:
 - Previous treatments have failed
 
 **Note:** This is a preliminary assessment. For accurate diagnosis, consult with agricultural experts or plant pathologists.
-"""
-    
-    return result
-
-def government_schemes_tool(farmer_category: str, state: str, scheme_type: str = "all") -> str:
-    """
-    Provides information about government schemes available for farmers.
-    
-    Args:
-        farmer_category: Category of farmer (small, marginal, large, tribal)
-        state: State/region of the farmer
-        scheme_type: Type of scheme (subsidy, loan, insurance, all)
-    
-    Returns:
-        Information about applicable government schemes
-    """
-    schemes = {
-        "central": {
-            "PM-KISAN": {
-                "description": "Direct income support to farmers",
-                "eligibility": "All landholding farmers",
-                "benefit": "₹6,000 per year in 3 installments",
-                "application": "Online through PM-KISAN portal"
-            },
-            "PMFBY": {
-                "description": "Pradhan Mantri Fasal Bima Yojana",
-                "eligibility": "All farmers including sharecroppers",
-                "benefit": "Crop insurance coverage",
-                "application": "Through banks and CSCs"
-            },
-            "KCC": {
-                "description": "Kisan Credit Card",
-                "eligibility": "Farmers with land records",
-                "benefit": "Credit facility for farming needs",
-                "application": "Through banks"
-            }
+""")
+    
+    return "".join(parts)
+
+# The scheme catalog is constant, so its markdown is rendered once at
+# import; the tool only splices the farmer category and state into the
+# pre-built skeleton.
+_GOVT_SCHEMES = {
+    "central": {
+        "PM-KISAN": {
+            "description": "Direct income support to farmers",
+            "eligibility": "All landholding farmers",
+            "benefit": "₹6,000 per year in 3 installments",
+            "application": "Online through PM-KISAN portal"
         },
-        "state_specific": {
-            "subsidy": [
-                "Fertilizer subsidy schemes",
-                "Seed subsidy programs",
-                "Equipment purchase subsidies",
-                "Irrigation development subsidies"
-            ],
-            "support": [
-                "Minimum Support Price (MSP)",
-                "Market linkage programs",
-                "Farmer Producer Organizations (FPO) support",
-                "Technical assistance programs"
-            ]
+        "PMFBY": {
+            "description": "Pradhan Mantri Fasal Bima Yojana",
+            "eligibility": "All farmers including sharecroppers",
+            "benefit": "Crop insurance coverage",
+            "application": "Through banks and CSCs"
+        },
+        "KCC": {
+            "description": "Kisan Credit Card",
+            "eligibility": "Farmers with land records",
+            "benefit": "Credit facility for farming needs",
+            "application": "Through banks"
         }
+    },
+    "state_specific": {
+        "subsidy": [
+            "Fertilizer subsidy schemes",
+            "Seed subsidy programs",
+            "Equipment purchase subsidies",
+            "Irrigation development subsidies"
+        ],
+        "support": [
+            "Minimum Support Price (MSP)",
+            "Market linkage programs",
+            "Farmer Producer Organizations (FPO) support",
+            "Technical assistance programs"
+        ]
     }
-    
-    result = f"""
-## Government Schemes for {farmer_category.title()} Farmers in {state.title()}
+}
+
+_CENTRAL_SCHEMES_MD = "".join(
+    f"""
+**{name}**
+- Description: {info['description']}
+- Eligibility: {info['eligibility']}
+- Benefit: {info['benefit']}
+- How to Apply: {info['application']}
+"""
+    for name, info in _GOVT_SCHEMES["central"].items()
+)
+
+_SUBSIDY_MD = "".join(f"• {item}\n" for item in _GOVT_SCHEMES["state_specific"]["subsidy"])
+_SUPPORT_MD = "".join(f"• {item}\n" for item in _GOVT_SCHEMES["state_specific"]["support"])
+
+_SCHEMES_REPORT_TMPL = """
+## Government Schemes for {farmer_category} Farmers in {state}
 
 ### Central Government Schemes:
-"""
-    
-    for scheme_name, scheme_info in schemes["central"].items():
-        result += f"""
-**{scheme_name}**
-- Description: {scheme_info['description']}
-- Eligibility: {scheme_info['eligibility']}
-- Benefit: {scheme_info['benefit']}
-- How to Apply: {scheme_info['application']}
-"""
-    
-    result += f"""
+""" + _CENTRAL_SCHEMES_MD + """
 ### State-Specific Schemes (General Categories):
 
 **Subsidy Schemes:**
-"""
-    for subsidy in schemes["state_specific"]["subsidy"]:
-        result += f"• {subsidy}\n"
-    
-    result += f"""
+""" + _SUBSIDY_MD + """
 **Support Programs:**
-"""
-    for support in schemes["state_specific"]["support"]:
-        result += f"• {support}\n"
-    
-    result += f"""
+""" + _SUPPORT_MD + """
 ### How to Apply:
 1. Visit your nearest Common Service Center (CSC)
 2. Contact local agriculture department
@@ -1278,10 +1714,25 @@ def government_schemes_tool(farmer_category: str, state: str, scheme_type: str =
 - Keep all documents updated
 - Apply within specified time limits
 
-For state-specific schemes in {state}, contact your local agriculture officer or visit the state agriculture department website.
+For state-specific schemes in {state_raw}, contact your local agriculture officer or visit the state agriculture department website.
 """
+
+@cached_tool(ttl=3600, maxsize=128)
+def government_schemes_tool(farmer_category: str, state: str, scheme_type: str = "all") -> str:
+    """
+    Provides information about government schemes available for farmers.
     
-    return result
+    Args:
+        farmer_category: Category of farmer (small, marginal, large, tribal)
+        state: State/region of the farmer
+        scheme_type: Type of scheme (subsidy, loan, insurance, all)
+    
+    Returns:
+        Information about applicable government schemes
+    """
+    return _SCHEMES_REPORT_TMPL.format(
+        farmer_category=farmer_category.title(), state=state.title(), state_raw=state
+    )
 
 def npk_management_tool(soil_test_report: str, crop_type: str, field_size: str) -> str:
     """
@@ -1295,66 +1746,14 @@ def npk_management_tool(soil_test_report: str, crop_type: str, field_size: str)
     Returns:
         NPK management recommendations
     """
-    npk_requirements = {
-        "rice": {"N": 120, "P": 60, "K": 40},
-        "wheat": {"N": 120, "P": 60, "K": 40},
-        "corn": {"N": 150, "P": 75, "K": 50},
-        "tomato": {"N": 150, "P": 75, "K": 50},
-        "potato": {"N": 180, "P": 90, "K": 100},
-        "cotton": {"N": 120, "P": 60, "K": 50}
-    }
-    
-    crop_npk = npk_requirements.get(crop_type.lower(), {"N": 100, "P": 50, "K": 50})
+    crop_key = crop_type.lower()
+    crop_npk = _NPK_REQUIREMENTS.get(crop_key, _DEFAULT_NPK)
     
-    result = f"""
-## NPK Management Plan for {crop_type.title()}
-
-**Field Size:** {field_size}
-**Current Soil Status:** {soil_test_report}
-
-### Recommended NPK Application:
-- **Nitrogen (N):** {crop_npk['N']} kg/ha
-- **Phosphorus (P₂O₅):** {crop_npk['P']} kg/ha  
-- **Potassium (K₂O):** {crop_npk['K']} kg/ha
-
-### Application Schedule:
-
-**Basal Application (at sowing):**
-- Full dose of Phosphorus
-- Full dose of Potassium
-- 25% of Nitrogen
-
-**Top Dressing:**
-- 50% of Nitrogen at vegetative stage
-- 25% of Nitrogen at reproductive stage
-
-### Fertilizer Sources:
-- **Nitrogen:** Urea (46% N), Ammonium Sulfate (20% N)
-- **Phosphorus:** DAP (18-46-0), SSP (16% P₂O₅)
-- **Potassium:** MOP (60% K₂O), SOP (50% K₂O)
-
-### Organic Alternatives:
-- **Nitrogen:** Farmyard manure, Compost, Green manure
-- **Phosphorus:** Bone meal, Rock phosphate
-- **Potassium:** Wood ash, Kelp meal
-
-### Application Tips:
-1. Apply fertilizers in the evening or early morning
-2. Ensure adequate soil moisture
-3. Mix fertilizers with soil properly
-4. Avoid over-application to prevent nutrient burn
-5. Consider split application for better efficiency
-
-### Monitoring:
-- Observe plant growth and color
-- Check for nutrient deficiency symptoms
-- Adjust application based on crop response
-- Conduct soil testing annually
-
-**Note:** These are general recommendations. Adjust based on actual soil test results and local conditions.
-"""
-    
-    return result
+    return _NPK_REPORT_TMPL.format(
+        crop_title=_TITLE_CROPS.get(crop_key, crop_type.title()), field_size=field_size,
+        soil_test_report=soil_test_report,
+        n=crop_npk['N'], p=crop_npk['P'], k=crop_npk['K'],
+    )
 
 def campaign_management_tool(crop_type: str, estimated_quantity: str, harvest_date: str, location: str, min_price_per_unit: str, quality_grade: str = "A", farming_method: str = "conventional") -> str:
     """
@@ -1372,47 +1771,10 @@ def campaign_management_tool(crop_type: str, estimated_quantity: str, harvest_da
     Returns:
         Contract farming campaign details for buyer portal visibility
     """
-    # Contract farming quality standards and certifications
-    quality_standards = {
-        "A": {"description": "Premium quality", "premium_percent": 15},
-        "B": {"description": "Standard quality", "premium_percent": 5},
-        "C": {"description": "Basic quality", "premium_percent": 0},
-        "Premium": {"description": "Export quality", "premium_percent": 25},
-        "Standard": {"description": "Domestic market quality", "premium_percent": 0}
-    }
-    
-    # Farming method certifications and buyer preferences
-    farming_methods = {
-        "organic": {
-            "certification": "Organic certification required",
-            "buyer_demand": "High",
-            "price_premium": "20-30%",
-            "requirements": ["No synthetic pesticides", "Organic fertilizers only", "3-year transition period"]
-        },
-        "natural": {
-            "certification": "Natural farming practices",
-            "buyer_demand": "Growing",
-            "price_premium": "10-15%",
-            "requirements": ["Minimal external inputs", "Natural pest control", "Soil health focus"]
-        },
-        "conventional": {
-            "certification": "Standard farming practices",
-            "buyer_demand": "Stable",
-            "price_premium": "0%",
-            "requirements": ["Good agricultural practices", "Quality standards compliance"]
-        },
-        "sustainable": {
-            "certification": "Sustainable agriculture certification",
-            "buyer_demand": "Increasing",
-            "price_premium": "5-10%",
-            "requirements": ["Resource conservation", "Biodiversity protection", "Community benefits"]
-        }
-    }
+    quality_info = _QUALITY_STANDARDS.get(quality_grade, _QUALITY_STANDARDS["A"])
+    method_info = _FARMING_METHODS.get(farming_method.lower(), _FARMING_METHODS["conventional"])
     
-    quality_info = quality_standards.get(quality_grade, quality_standards["A"])
-    method_info = farming_methods.get(farming_method.lower(), farming_methods["conventional"])
-    
-    result = f"""
+    parts = [f"""
 ## Contract Farming Campaign: {crop_type.title()}
 
 **📍 Location:** {location}
@@ -1435,12 +1797,12 @@ from **{location}**.
 - **Price Premium:** {method_info['price_premium']}
 
 ### 🔍 Quality Assurance:
-"""
+"""]
     
     for requirement in method_info['requirements']:
-        result += f"• {requirement}\n"
+        parts.append(f"• {requirement}\n")
     
-    result += f"""
+    parts.append(f"""
 ### 💼 For Potential Buyers:
 - **Minimum Order:** Contact farmer for minimum order quantities
 - **Delivery Options:** Farm pickup or local delivery (to be negotiated)
@@ -1482,9 +1844,22 @@ wholesalers, and institutional buyers looking for quality {crop_type} produce.
 
 **Campaign Status:** Active and accepting buyer inquiries
 **Last Updated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}
-"""
-    
-    return result
+""")
+    
+    return "".join(parts)
+
+# Agent instructions live in prompts/ as markdown so prompt edits do not
+# touch code, and the static system prefix stays byte-identical across
+# processes and turns - a prerequisite for Gemini's prompt caching to
+# recognize and reuse it.
+_PROMPTS_DIR = Path(__file__).resolve().parent / "prompts"
+_FARMER_INSTRUCTION = (_PROMPTS_DIR / "farmer_instruction.md").read_text(encoding="utf-8")
+_DISEASE_SPECIALIST_INSTRUCTION = (
+    _PROMPTS_DIR / "disease_specialist_instruction.md"
+).read_text(encoding="utf-8")
+_ADVANCED_ANALYSIS_INSTRUCTION = (
+    _PROMPTS_DIR / "advanced_analysis_instruction.md"
+).read_text(encoding="utf-8")
 
 # Create tool instances
 # Original farming tools
@@ -1503,88 +1878,62 @@ fetch_documents = FunctionTool(fetch_documents_tool)
 update_campaign = FunctionTool(update_campaign_tool)
 create_bid = FunctionTool(create_bid_tool)
 
+# Two-tier model routing: the unified agent runs on the cheap Flash tier
+# and handles routing, schemes, NPK, and campaign turns directly; vision
+# and multi-step planning turns transfer to the heavier analysis agent.
+# Both models can be overridden per deployment via the environment.
+_ROUTER_MODEL = os.environ.get("AGENT_MODEL", "gemini-2.0-flash")
+_HEAVY_MODEL = os.environ.get("HEAVY_AGENT_MODEL", "gemini-2.5-pro")
+
+def _freeze_tool_declarations(tools):
+    """Precomputes each tool's function declaration once at import.
+
+    ADK rebuilds the JSON schema from signature/docstring reflection every
+    time a declaration is requested (per Agent construction, per AdkApp
+    wrap). The signatures are static, so pin the built declaration on the
+    instance. Best-effort: any ADK version drift just keeps lazy behavior.
+    """
+    for tool in tools:
+        try:
+            declaration = tool._get_declaration()
+            tool._get_declaration = lambda _decl=declaration: _decl
+        except Exception as e:
+            logger.debug("Could not freeze declaration for %s: %s", tool, e)
+
+_freeze_tool_declarations([
+    plant_health, government_schemes, npk_management, campaign_management,
+    ai_crop_planner, crop_health_analyzer,
+    create_campaign, fetch_documents, update_campaign, create_bid,
+])
+
 # Create a specialized disease explanation sub-agent
 disease_explanation_agent = Agent(
     name="disease_explanation_specialist",
-    model="gemini-2.0-flash-exp",
+    model=_ROUTER_MODEL,
     description="Specialized agent for providing detailed disease explanations, symptoms, treatments, and preventive measures",
-    instruction="""You are a plant pathology specialist. When given a plant disease name, provide a comprehensive response including:
-
-1. **Brief Description**: What this disease is and how it affects plants
-2. **Symptoms**: Detailed symptoms farmers should look for
-3. **Treatment Steps**: Step-by-step treatment recommendations
-4. **Preventive Measures**: How to prevent this disease in the future
-
-Format your response with clear headers and bullet points for easy reading. Be practical and focus on actionable advice for farmers.
+    instruction=_DISEASE_SPECIALIST_INSTRUCTION
+)
 
-If the disease name contains "healthy", congratulate the farmer and provide maintenance tips instead of treatment."""
+# Heavy tier: image analysis and AI crop planning justify the larger model
+advanced_analysis_agent = Agent(
+    name="advanced_analysis_specialist",
+    model=_HEAVY_MODEL,
+    description="Specialized agent for crop image disease analysis and AI-powered crop planning that needs vision and multi-step reasoning",
+    instruction=_ADVANCED_ANALYSIS_INSTRUCTION,
+    tools=[
+        ai_crop_planner,
+        crop_health_analyzer,
+    ],
 )
 
 # Create the unified farmer AI agent (replacing both root_agent and comprehensive_agent)
 unified_farmer_agent = Agent(
     name="unified_farmer_ai",
-    model="gemini-2.0-flash-exp",  # Single gemini-2.5-pro for everything - text, voice, images, reasoning
+    model=_ROUTER_MODEL,  # Flash tier: routing and light tools; heavy turns transfer
     description="Unified AI assistant for farmers with comprehensive capabilities including text, voice, image processing, crop planning, disease diagnosis, contract farming, and government schemes",
-    instruction="""You are a comprehensive farming assistant with expertise in all agricultural domains. You can handle ALL types of input and provide complete farming solutions directly.
-
-**Input Capabilities:**
-- **Text Messages**: Natural language questions and conversations in any language
-- **Voice/Audio Input**: Spoken queries in multiple languages (Kannada, Hindi, English ), Input and output language are both should be same
-- **Image Analysis**: Plant/crop photos for disease detection and health assessment
-- **Multimodal Combinations**: Text + images, voice + images, voice + text, etc.
-
-**Core Farming Expertise:**
-1. **AI-Powered Crop Planning** - Use ai_crop_planner_tool for soil-based recommendations
-2. **Disease Diagnosis & Health Analysis** - Use crop_health_analyzer_tool for image-based detection
-3. **Contract Farming & Marketing** - Use create_campaign_tool, fetch_documents_tool for campaigns
-4. **Government Schemes & Support** - Use government_schemes_tool for subsidies and loans
-5. **Soil & NPK Management** - Use npk_management_tool for fertilizer recommendations
-
-**Interaction Style:**
-- **Text Input**: Provide detailed, comprehensive responses with actionable advice
-- **Voice Input**: Give warm, conversational responses while maintaining completeness
-- **Image Input**: Automatically analyze plant/crop images for diseases or health issues
-- **Multilingual**: Respond in the language used by the farmer (Hindi, English, regional languages)
-
-**Tool Usage Strategy:**
-- When farmers ask about crop selection → Use ai_crop_planner_tool
-- When farmers upload plant images → Use crop_health_analyzer_tool automatically
-- When farmers ask about government help → Use government_schemes_tool
-- When farmers ask about soil/fertilizers → Use npk_management_tool
-- When farmers want to sell crops → Use create_campaign_tool
-- When farmers want to see market opportunities → Use fetch_documents_tool
-
-**Response Guidelines:**
-- Be warm, empathetic, and farmer-friendly
-- Provide practical, actionable advice considering local conditions
-- Consider economic constraints and sustainability
-- Ask clarifying questions when needed to give better advice
-- Use tools proactively based on the type of question
-- Explain what you're doing when using tools
-
-**Language Support:**
-- Support Hindi: "मैं आपकी हिंदी में मदद कर सकता हूं"
-- Support English: "I can help you with all farming questions"
-- Support regional languages as needed
-- Translate technical terms when helpful
-
-**Example Interactions:**
-- "मेरी फसल में क्या बीमारी है?" (with image) → Automatically use crop_health_analyzer_tool
-- "I want to plan wheat cultivation for 5 acres" → Use ai_crop_planner_tool
-- "What government schemes can help small farmers?" → Use government_schemes_tool
-- "My soil test shows N:80, P:60, K:70" → Use ai_crop_planner_tool
-- "I want to sell my tomato harvest" → Use create_campaign_tool
-
-**Sub-Agent Delegation:**
-- For detailed disease explanations, you can delegate to the disease_explanation_specialist agent using transfer_to_agent(agent_name='disease_explanation_specialist')
-
-**Important**: You are the complete farming solution. Handle everything directly with your tools and knowledge. No need for complex delegation - you have all the capabilities needed to help farmers succeed with gemini-2.0-flash-pre's advanced multimodal and reasoning capabilities.""",
+    instruction=_FARMER_INSTRUCTION,
     tools=[
-        # AI-powered tools
-        ai_crop_planner,
-        crop_health_analyzer,
-        
-        # Traditional farming tools
+        # Traditional farming tools (cheap, handled on the Flash tier)
         government_schemes,
         npk_management,
         
@@ -1594,7 +1943,9 @@ unified_farmer_agent = Agent(
         update_campaign,
         create_bid
     ],
-    sub_agents=[disease_explanation_agent]  # Specialized disease explanation agent
+    # Vision/planning turns escalate to the heavy tier; disease explanations
+    # go to the dedicated specialist
+    sub_agents=[advanced_analysis_agent, disease_explanation_agent]
 )
 
 # For backward compatibility, create aliases
@@ -1610,12 +1961,10 @@ if __name__ == "__main__":
     
     # Initialize runner with the unified agent
     runner = InMemoryRunner(agent=unified_farmer_agent)
-    session = runner.session_service.create_session(
-        app_name=runner.app_name, user_id="test_farmer"
-    )
     
-    # Test queries for the unified agent
-    test_queries = [
+    # Test queries for the unified agent (frozen fixture; contents are
+    # prebuilt once so reruns skip per-iteration pydantic validation)
+    test_queries = (
         "Hello, I'm a farmer from Punjab. I want to plan wheat cultivation for this rabi season.",
         "My tomato plants are showing yellow spots on leaves. What should I do?", 
         "I'm a small farmer. What government schemes can help me get a loan?",
@@ -1624,32 +1973,78 @@ if __name__ == "__main__":
         "I want to create a contract farming campaign: Title: 'Organic Tomato Contract', Crop: Tomato, Type: Cherry, Location: Maharashtra, Quantity: 2 tons, Harvest: May 2025, Price: ₹50 per kg, Quality: Premium, Method: organic",
         "Can you show me all active contract farming campaigns in the database?",
         "I want to use AI to recommend crops for my 5-acre farm. My soil has N:80, P:60, K:70, pH:6.8"
-    ]
+    )
+    test_contents = tuple(UserContent(parts=[Part(text=q)]) for q in test_queries)
     
     print("=== Unified Farmer AI Agent Test ===\n")
-    print("✅ Using single gemini-2.0-flash-pre agent for all capabilities")
-    print("   - Text, voice, and image processing")
-    print("   - All farming tools integrated directly") 
-    print("   - No delegation overhead")
-    print("   - 50% cost reduction vs dual-agent setup\n")
-    
-    for i, query in enumerate(test_queries, 1):
+    print(f"✅ Flash-tier router ({_ROUTER_MODEL}) with tiered specialists")
+    print("   - Text, voice, and light tools handled on the router")
+    print(f"   - Vision and crop planning escalate to {_HEAVY_MODEL}")
+    print("   - Disease explanations go to the dedicated specialist\n")
+    
+    async def run_one(i, query, content):
+        """Runs one query in its own session, buffering output so the
+        interleaved test runs still print as coherent blocks."""
+        lines = [f"Test Query {i}: {query}", "-" * 50]
+        # One session per query: no history cross-contamination between
+        # the independent test scenarios
+        session = await runner.session_service.create_session(
+            app_name=runner.app_name, user_id="test_farmer"
+        )
+        try:
+            async for event in runner.run_async(
+                user_id=session.user_id,
+                session_id=session.id,
+                new_message=content,
+            ):
+                # getattr with a default instead of hasattr probing: one
+                # lookup per attribute, no exception machinery per event
+                event_content = getattr(event, 'content', None)
+                for part in getattr(event_content, 'parts', None) or ():
+                    text = getattr(part, 'text', None)
+                    if text:
+                        lines.append(text)
+        except Exception as e:
+            lines.append(f"Error: {e}")
+        lines.append("\n" + "=" * 70 + "\n")
+        print("\n".join(str(line) for line in lines))
+    
+    async def run_streaming(i, query, content):
+        """Serial mode: prints text deltas as they arrive so the console
+        shows first-token latency instead of full-response latency."""
+        import sys as _sys
         print(f"Test Query {i}: {query}")
         print("-" * 50)
-        
-        content = UserContent(parts=[Part(text=query)])
-        
+        session = await runner.session_service.create_session(
+            app_name=runner.app_name, user_id="test_farmer"
+        )
         try:
-            for event in runner.run(
+            async for event in runner.run_async(
                 user_id=session.user_id,
-                session_id=session.id, 
-                new_message=content
+                session_id=session.id,
+                new_message=content,
             ):
-                if hasattr(event, 'content') and hasattr(event.content, 'parts'):
-                    for part in event.content.parts:
-                        if hasattr(part, 'text'):
-                            print(part.text)
+                event_content = getattr(event, 'content', None)
+                for part in getattr(event_content, 'parts', None) or ():
+                    text = getattr(part, 'text', None)
+                    if text:
+                        _sys.stdout.write(text)
+                        _sys.stdout.flush()
         except Exception as e:
             print(f"Error: {e}")
-        
-        print("\n" + "="*70 + "\n")
+        print("\n" + "=" * 70 + "\n")
+    
+    async def run_all():
+        if os.environ.get("STREAM_TESTS") == "1":
+            # Token-by-token output; queries run serially to stay readable
+            for i, (q, c) in enumerate(zip(test_queries, test_contents), 1):
+                await run_streaming(i, q, c)
+        else:
+            # Independent queries overlap their Gemini round-trips instead
+            # of executing strictly serially
+            await asyncio.gather(
+                *(run_one(i, q, c)
+                  for i, (q, c) in enumerate(zip(test_queries, test_contents), 1))
+            )
+    
+    asyncio.run(run_all())
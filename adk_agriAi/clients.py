@@ -0,0 +1,56 @@
+"""Shared lazily-initialized service clients.
+
+Every tool invocation reuses the same Firestore client (and its gRPC
+channel pool) instead of paying TLS + OAuth setup per call. The getter
+is lru_cached, so concurrent first calls initialize exactly once.
+
+Gemini clients are not managed here: ADK owns the model connection via
+Agent(model=...) and already pools it per process.
+"""
+
+import functools
+import os
+
+
+@functools.lru_cache(maxsize=1)
+def get_firestore():
+    """
+    Imports firebase_admin and initializes the async Firestore client on
+    first use. Returns (db, firestore_module), or (None, None) when the SDK
+    or credentials are unavailable (offline mode).
+
+    The firebase_admin/gRPC import costs hundreds of ms, so nothing is
+    imported until the first tool call that actually touches the database.
+    """
+    try:
+        import firebase_admin
+        from firebase_admin import credentials, firestore, firestore_async
+    except Exception as e:
+        print(f"⚠️ Firestore not available: {e}")
+        return None, None
+
+    if not firebase_admin._apps:
+        try:
+            # The path to your service account key JSON file
+            script_dir = os.path.dirname(os.path.abspath(__file__))
+            service_key_path = os.path.join(script_dir, "serviceKey.json")
+            cred = credentials.Certificate(service_key_path)
+            firebase_admin.initialize_app(cred)
+        except FileNotFoundError:
+            print(f"🔥 Failed to initialize Firestore: serviceKey.json file not found")
+            print("   Please ensure 'serviceKey.json' is in the correct directory.")
+            return None, None
+        except Exception as e:
+            print(f"🔥 Failed to initialize Firestore: {e}")
+            print("   Please check your serviceKey.json file and Firebase configuration.")
+            return None, None
+
+    # Async client so tool coroutines never block the agent's event loop
+    db = firestore_async.client()
+    print("✅ Firestore initialized successfully.")
+    return db, firestore
+
+
+def get_db():
+    """Returns the Firestore database client instance (lazily initialized)."""
+    return get_firestore()[0]
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Offline converter: RandomForest-2.pkl -> crop_model.onnx
+
+Run this once at build time so agent.py can serve crop recommendations
+through onnxruntime instead of sklearn's predict_proba (which has very
+high single-row latency). Also writes crop_model_classes.json so the
+agent never needs to unpickle the sklearn model at runtime.
+
+Requires: scikit-learn, skl2onnx (build-time only)
+"""
+
+import json
+import os
+import pickle
+
+import numpy as np
+from skl2onnx import convert_sklearn
+from skl2onnx.common.data_types import FloatTensorType
+
+working_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+def main():
+    crop_model_path = os.path.join(working_dir, "RandomForest-2.pkl")
+    onnx_model_path = os.path.join(working_dir, "crop_model.onnx")
+    classes_path = os.path.join(working_dir, "crop_model_classes.json")
+
+    print(f"📦 Loading sklearn model from {crop_model_path}...")
+    with open(crop_model_path, 'rb') as file:
+        crop_model = pickle.load(file)
+
+    # 7 features: N, P, K, temperature, humidity, ph, rainfall
+    # zipmap=False makes the probability output a plain float tensor
+    # instead of a list of dicts, which is what agent.py expects.
+    print("🔄 Converting to ONNX...")
+    onnx_model = convert_sklearn(
+        crop_model,
+        initial_types=[("X", FloatTensorType([None, 7]))],
+        options={id(crop_model): {"zipmap": False}},
+    )
+
+    with open(onnx_model_path, 'wb') as f:
+        f.write(onnx_model.SerializeToString())
+    print(f"✅ Saved ONNX model to {onnx_model_path}")
+
+    with open(classes_path, 'w') as f:
+        json.dump(np.asarray(crop_model.classes_).tolist(), f)
+    print(f"✅ Saved class labels to {classes_path}")
+
+    # Also re-dump as joblib: agent.py mmaps this as a stopgap when the ONNX
+    # artifact is missing, so workers share the forest's memory pages
+    import joblib
+    joblib_path = os.path.join(working_dir, "RandomForest-2.joblib")
+    joblib.dump(crop_model, joblib_path)
+    print(f"✅ Saved joblib model to {joblib_path}")
+
+    # Sanity check: compare ONNX probabilities against sklearn
+    try:
+        import onnxruntime as ort
+        sess = ort.InferenceSession(onnx_model_path, providers=["CPUExecutionProvider"])
+        sample = np.array([[90, 42, 43, 20.8, 82.0, 6.5, 202.9]], dtype=np.float32)
+        onnx_probs = sess.run(None, {"X": sample})[1][0]
+        sk_probs = crop_model.predict_proba(sample)[0]
+        if np.allclose(onnx_probs, sk_probs, atol=1e-4):
+            print("✅ ONNX predictions match sklearn")
+        else:
+            print("⚠️ ONNX predictions differ from sklearn - please investigate")
+    except ImportError:
+        print("⚠️ onnxruntime not installed - skipping verification")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Offline converter: plant_disease_prediction_model.h5 -> plant_disease.tflite
+
+Run this once at build time so agent.py can serve disease predictions
+through the TFLite interpreter instead of Keras predict(). Int8
+quantization (with a representative dataset) cuts the model size ~4x and
+enables XNNPACK's quantized kernels for 2-5x lower single-image latency.
+
+Requires: tensorflow (build-time only)
+"""
+
+import os
+
+import numpy as np
+import tensorflow as tf
+
+working_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+def representative_dataset():
+    """Yields random calibration images in the model's [0, 1] input range."""
+    rng = np.random.default_rng(42)
+    for _ in range(100):
+        yield [rng.random((1, 224, 224, 3), dtype=np.float32)]
+
+
+def main():
+    model_path = os.path.join(working_dir, "plant_disease_prediction_model.h5")
+    tflite_path = os.path.join(working_dir, "plant_disease.tflite")
+
+    print(f"📦 Loading Keras model from {model_path}...")
+    model = tf.keras.models.load_model(model_path, compile=False)
+
+    # Export the SavedModel first - agent.py falls back to its serving
+    # signature when the TFLite artifact is unavailable, which still loads
+    # much faster than rebuilding the Keras graph from the .h5 config
+    saved_model_path = os.path.join(working_dir, "plant_disease_savedmodel")
+    print(f"🔄 Exporting SavedModel to {saved_model_path}...")
+    model.save(saved_model_path)
+    print("✅ SavedModel exported")
+
+    print("🔄 Converting to int8-quantized TFLite...")
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_dataset
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    # Keep float32 input/output so agent.py's preprocessing stays unchanged
+    converter.inference_input_type = tf.float32
+    converter.inference_output_type = tf.float32
+    tflite_model = converter.convert()
+
+    with open(tflite_path, 'wb') as f:
+        f.write(tflite_model)
+
+    original_size = os.path.getsize(model_path) / (1024 * 1024)
+    tflite_size = os.path.getsize(tflite_path) / (1024 * 1024)
+    print(f"✅ Saved TFLite model to {tflite_path}")
+    print(f"   Size: {original_size:.1f} MB -> {tflite_size:.1f} MB")
+
+    # Sanity check: run one inference through the interpreter
+    interpreter = tf.lite.Interpreter(model_path=tflite_path)
+    interpreter.allocate_tensors()
+    input_detail = interpreter.get_input_details()[0]
+    output_detail = interpreter.get_output_details()[0]
+    interpreter.set_tensor(input_detail["index"], np.zeros((1, 224, 224, 3), np.float32))
+    interpreter.invoke()
+    predictions = interpreter.get_tensor(output_detail["index"])
+    print(f"✅ TFLite inference OK - output shape {predictions.shape}")
+
+
+if __name__ == "__main__":
+    main()
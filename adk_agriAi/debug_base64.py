@@ -1,10 +1,29 @@
 #!/usr/bin/env python3
 """Debug script to understand the ADK ToolContext data format"""
 
-import base64
-import tempfile
-import os
-from PIL import Image
+try:
+    import pybase64 as base64  # SIMD decoder, drop-in b64encode/b64decode
+except ImportError:
+    import base64
+import io
+from PIL import Image, UnidentifiedImageError
+
+# Magic numbers for the formats we accept; one startswith() memcmp beats
+# a speculative base64 decode of a multi-MB buffer
+IMG_MAGIC = (b'\x89PNG\r\n\x1a\n', b'\xff\xd8\xff', b'GIF87a', b'GIF89a', b'RIFF', b'BM')
+
+def to_raw_bytes(data):
+    """Normalizes str/bytes input to raw image bytes.
+
+    Raw payloads are recognized by magic number; everything else must be
+    valid base64 (validate=True so garbage fails fast instead of decoding
+    to nonsense).
+    """
+    if isinstance(data, str):
+        data = data.encode('ascii')
+    if data.startswith(IMG_MAGIC):
+        return data
+    return base64.b64decode(data, validate=True)
 
 def debug_base64_data():
     """Test different base64 scenarios to understand the issue"""
@@ -13,7 +32,6 @@ def debug_base64_data():
     test_image = Image.new('RGB', (100, 100), color='red')
     
     # Save to memory and get base64
-    import io
     buffer = io.BytesIO()
     test_image.save(buffer, format='PNG')
     buffer.seek(0)
@@ -67,26 +85,21 @@ def debug_base64_data():
     print(f"Corrupt data size: {len(corrupt_data)} bytes")
     print(f"Corrupt header: {corrupt_data[:20]}")
     
-    # Try to save and open corrupt data
+    # Try to open corrupt data straight from memory
     try:
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_file:
-            temp_file.write(corrupt_data)
-            temp_file_path = temp_file.name
-        
-        # This should fail like in the error
-        img = Image.open(temp_file_path)
+        # This should fail like in the error; load() forces the decode so
+        # the failure surfaces here instead of lazily
+        img = Image.open(io.BytesIO(corrupt_data))
+        img.load()
         print("Corrupt data opened successfully (unexpected)")
-        os.unlink(temp_file_path)
-    except Exception as e:
+    except (UnidentifiedImageError, OSError) as e:
         print(f"Expected error with corrupt data: {e}")
-        os.unlink(temp_file_path)
 
 def test_different_data_access_patterns():
     """Test different ways to access inline_data.data"""
     
     # Create test data
     test_image = Image.new('RGB', (50, 50), color='blue')
-    import io
     buffer = io.BytesIO()
     test_image.save(buffer, format='JPEG')
     buffer.seek(0)
@@ -114,41 +127,21 @@ def test_different_data_access_patterns():
         
         # Try to process this data like our function would
         try:
-            if isinstance(data, str):
-                print("  -> Treating as base64 string")
-                image_data = base64.b64decode(data)
-            elif isinstance(data, bytes):
-                # Check if it looks like base64
-                try:
-                    decoded_test = base64.b64decode(data.decode('utf-8'))
-                    if len(decoded_test) > len(data):
-                        print("  -> Treating as base64 in bytes")
-                        image_data = decoded_test
-                    else:
-                        print("  -> Treating as raw bytes")
-                        image_data = data
-                except:
-                    print("  -> Treating as raw bytes")
-                    image_data = data
+            image_data = to_raw_bytes(data)
+            kind = "raw bytes (magic number)" if image_data is data else "base64"
+            print(f"  -> Treating as {kind}")
             
             print(f"  -> Final image data: {len(image_data)} bytes")
             print(f"  -> Header: {image_data[:10]}")
             
-            # Try to save and open
-            with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as temp_file:
-                temp_file.write(image_data)
-                temp_file_path = temp_file.name
-            
-            img = Image.open(temp_file_path)
+            # Try to open straight from the in-memory bytes; load() forces
+            # the full decode so truncated data fails here
+            img = Image.open(io.BytesIO(image_data))
+            img.load()
             print(f"  -> ✅ Successfully opened: {img.format}, {img.mode}, {img.size}")
-            os.unlink(temp_file_path)
             
         except Exception as e:
             print(f"  -> ❌ Error: {e}")
-            try:
-                os.unlink(temp_file_path)
-            except:
-                pass
 
 if __name__ == "__main__":
     debug_base64_data()
@@ -0,0 +1,35 @@
+"""Fast JSON helpers backed by orjson with a stdlib fallback.
+
+orjson encodes/decodes several times faster than the stdlib module,
+which matters for campaign-document arrays going through the tools.
+Callers get str out of dumps() either way; orjson's native bytes are
+decoded once at this boundary.
+"""
+
+import json as _json
+
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+if _orjson is not None:
+    def loads(data):
+        """Parses JSON from str/bytes."""
+        return _orjson.loads(data)
+
+    def dumps(obj, indent=False, default=None):
+        """Serializes obj to a JSON str; indent=True pretty-prints."""
+        option = _orjson.OPT_SERIALIZE_NUMPY | _orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= _orjson.OPT_INDENT_2
+        return _orjson.dumps(obj, option=option, default=default).decode()
+else:
+    def loads(data):
+        """Parses JSON from str/bytes."""
+        return _json.loads(data)
+
+    def dumps(obj, indent=False, default=None):
+        """Serializes obj to a JSON str; indent=True pretty-prints."""
+        return _json.dumps(obj, indent=2 if indent else None, default=default)
@@ -0,0 +1,118 @@
+"""Shared TTL+LRU caching for agent tool calls.
+
+Repeat turns frequently re-invoke tools with identical arguments (same
+state+category scheme lookup, same campaign filter). The decorator here
+memoizes results keyed on the canonicalized call arguments so repeats
+resolve from memory instead of re-running the tool.
+
+Usage:
+    @cached_tool(ttl=300, maxsize=256)
+    def my_tool(arg1: str, arg2: str = "x") -> str: ...
+
+Works for both sync and async tools. Calls with bytes-like arguments
+(image/audio payloads) bypass the cache entirely - hashing megabytes of
+pixels to save a string render is a net loss, and the image pipeline has
+its own content-addressed caches.
+"""
+
+import functools
+import threading
+
+import json_fast
+
+from cachetools import TTLCache
+
+_lock = threading.RLock()
+_stats = {"hits": 0, "misses": 0, "bypasses": 0}
+_caches = {}
+
+
+def _cache_key(args, kwargs):
+    """Canonicalizes call arguments into a stable hashable key.
+
+    Returns None when any argument is bytes-like, which callers treat as
+    "do not cache".
+    """
+    for value in args:
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return None
+    for value in kwargs.values():
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return None
+    # sort kwargs for a stable key; orjson has no sort_keys for lists, so
+    # canonicalize the mapping ourselves
+    return json_fast.dumps([args, dict(sorted(kwargs.items()))], default=str)
+
+
+def cached_tool(ttl=300, maxsize=256):
+    """Decorator memoizing a tool's result per canonicalized arguments."""
+
+    def decorate(func):
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        _caches[func.__name__] = cache
+
+        def lookup(args, kwargs):
+            key = _cache_key(args, kwargs)
+            if key is None:
+                with _lock:
+                    _stats["bypasses"] += 1
+                return None, None
+            with _lock:
+                result = cache.get(key)
+                if result is not None:
+                    _stats["hits"] += 1
+                else:
+                    _stats["misses"] += 1
+            return key, result
+
+        def store(key, result):
+            with _lock:
+                cache[key] = result
+
+        if _is_async(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key, result = lookup(args, kwargs)
+                if result is not None:
+                    return result
+                result = await func(*args, **kwargs)
+                if key is not None:
+                    store(key, result)
+                return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key, result = lookup(args, kwargs)
+            if result is not None:
+                return result
+            result = func(*args, **kwargs)
+            if key is not None:
+                store(key, result)
+            return result
+        return wrapper
+
+    return decorate
+
+
+def _is_async(func):
+    import inspect
+    return inspect.iscoroutinefunction(func)
+
+
+def invalidate_tool_cache(tool_name=None):
+    """Clears one tool's cache, or every cache when no name is given."""
+    with _lock:
+        if tool_name is not None:
+            cache = _caches.get(tool_name)
+            if cache is not None:
+                cache.clear()
+        else:
+            for cache in _caches.values():
+                cache.clear()
+
+
+def get_tool_cache_stats():
+    """Returns a snapshot of hit/miss/bypass counters across all tools."""
+    with _lock:
+        return dict(_stats)
@@ -4,10 +4,13 @@ Provides a web interface similar to ADK web interface for interacting with the f
 """
 
 import os
-import json
 import asyncio
 import base64
+import struct
 import uuid
+from dataclasses import dataclass
+import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -22,35 +25,108 @@ from google.adk.agents import LiveRequestQueue
 from google.adk.agents.run_config import RunConfig
 from google.adk.sessions.in_memory_session_service import InMemorySessionService
 
-from fastapi import FastAPI, WebSocket, Request
+from fastapi import FastAPI, HTTPException, WebSocket, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+# Optional: SIMD base64 (pybase64 decodes large payloads at memory
+# bandwidth); stdlib base64 is the drop-in fallback
+try:
+    import pybase64 as _b64
+except ImportError:
+    _b64 = base64
+
+# Optional: library-side SSE framing (keep-alive pings, Cache-Control and
+# X-Accel-Buffering headers handled in sse-starlette instead of per-event
+# Python f-strings). Falls back to hand-framed StreamingResponse below.
+try:
+    from sse_starlette.sse import EventSourceResponse, ServerSentEvent
+except ImportError:
+    EventSourceResponse = None
+    ServerSentEvent = None
+
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from agent import unified_farmer_agent
+import json_fast
 
 # Load environment variables
 load_dotenv()
 
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"))
+logger = logging.getLogger(__name__)
+
 APP_NAME = "Farmer AI Web Interface"
 
-# Initialize FastAPI app
-app = FastAPI(
-    title="Farmer AI Assistant", 
-    description="Web interface for Farmer AI Agent",
-    debug=True
-)
+# One process-wide runner: session service state and tool registries are
+# built once and shared across connections; each connect only creates a
+# session on it
+RUNNER = None
+
+def _get_runner():
+    global RUNNER
+    if RUNNER is None:
+        RUNNER = InMemoryRunner(
+            app_name=APP_NAME,
+            agent=unified_farmer_agent,
+        )
+    return RUNNER
 
-# Add startup event
-@app.on_event("startup")
-async def startup_event():
+async def _warmup(runner):
+    """Runs one tiny synthetic turn so the first real request hits a warm
+    session service, compiled tool schemas, and an open model connection."""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    queue = LiveRequestQueue()
+    try:
+        session = await runner.session_service.create_session(
+            app_name=APP_NAME,
+            user_id="__warmup__",
+        )
+        queue.send_content(
+            content=Content(role="user", parts=[Part.from_text(text="ping")])
+        )
+        async for _ in runner.run_live(
+            session=session,
+            live_request_queue=queue,
+            run_config=RunConfig(streaming_mode="sse", response_modalities=["TEXT"]),
+        ):
+            break  # one event is enough to open the connection
+        print(f"✓ warmed in {loop.time() - started:.1f}s")
+    except Exception as e:
+        print(f"⚠️ Warmup failed (continuing cold): {e}")
+    finally:
+        queue.close()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
     print(f"🌾 Farmer AI Web Interface Starting...")
     print(f"📁 Static directory: {STATIC_DIR}")
     print(f"📄 Index file exists: {(STATIC_DIR / 'index.html').exists()}")
     print(f"🔗 Agent: {unified_farmer_agent.name if hasattr(unified_farmer_agent, 'name') else 'Loaded'}")
+    runner = _get_runner()
+    if os.environ.get("WARMUP") == "1":
+        await _warmup(runner)
+    gc_task = asyncio.create_task(gc_sessions())
     print(f"🚀 Server ready at: http://localhost:8000")
+    yield
+    gc_task.cancel()
+    # Drain whatever sessions are still live so queues close deterministically
+    for sess in list(sessions.values()):
+        try:
+            sess.queue.close()
+        except Exception:
+            pass
+    sessions.clear()
+
+# Initialize FastAPI app
+app = FastAPI(
+    title="Farmer AI Assistant", 
+    description="Web interface for Farmer AI Agent",
+    debug=True,
+    lifespan=lifespan
+)
 
 # Add CORS middleware
 app.add_middleware(
@@ -73,32 +149,68 @@ if not STATIC_DIR.exists():
 # Mount static files
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
-# Global session management
-active_sessions = {}
-session_modes = {}  # Track whether each session is in audio or text mode
+# index.html is read once here instead of stat()+open() per request; the
+# probe-hammered /health body is likewise encoded exactly once
+try:
+    _INDEX_BYTES = (STATIC_DIR / "index.html").read_bytes()
+except OSError:
+    _INDEX_BYTES = None
+_HEALTH_BYTES = json_fast.dumps(
+    {"status": "healthy", "agent": "farmer_ai", "version": "1.0.0"}
+).encode()
+
+# Global session management. One dict, one lookup per request; last_seen
+# lets the GC task below evict sessions whose cleanup never ran (SSE
+# disconnects don't always finalize the generator).
+@dataclass(slots=True)
+class Session:
+    queue: LiveRequestQueue
+    mode: str  # "audio" or "text"
+    last_seen: float
+
+sessions: dict = {}
+
+_SESSION_IDLE_SECONDS = 30 * 60
+
+async def gc_sessions():
+    """Evicts and closes sessions idle longer than _SESSION_IDLE_SECONDS."""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(60)
+        cutoff = loop.time() - _SESSION_IDLE_SECONDS
+        for user_id, sess in list(sessions.items()):
+            if sess.last_seen < cutoff:
+                sessions.pop(user_id, None)
+                try:
+                    sess.queue.close()
+                except Exception:
+                    pass
+                logger.info("GC evicted idle session for user %s", user_id)
+
+# Fixed-shape turn-status payloads, precomputed so the hot streaming loop
+# skips dict allocation and json.dumps for them (the booleans are the only
+# variable part, and JSON literals are spelled directly)
+_TURN_PAYLOAD_TMPL = '{"turn_complete":%s,"interrupted":%s}'
+_JSON_BOOL = {True: "true", False: "false", None: "false"}
 
 async def start_agent_session(user_id, is_audio=False):
     """Starts an agent session with proper modality configuration"""
-    print(f"[DEBUG] Starting agent session for user {user_id}, audio mode: {is_audio}")
+    logger.debug("Starting agent session for user %s, audio mode: %s", user_id, is_audio)
     
-    # Create a Runner
-    runner = InMemoryRunner(
-        app_name=APP_NAME,
-        agent=unified_farmer_agent,
-    )
-    print(f"[DEBUG] Runner created: {runner}")
+    # Reuse the process-wide Runner
+    runner = _get_runner()
     
     # Create a Session
     session = await runner.session_service.create_session(
         app_name=APP_NAME,
         user_id=user_id,
     )
-    print(f"[DEBUG] Session created: {session.id}")
+    logger.debug("Session created: %s", session.id)
     
     # Configure RunConfig with proper response modalities based on input type
     if is_audio:
         # For voice input, enable both audio and text output for better user experience
-        print(f"[DEBUG] Configuring for AUDIO mode - voice input/output")
+        logger.debug("Configuring for AUDIO mode - voice input/output")
         run_config = RunConfig(
             streaming_mode="sse",
             response_modalities=["AUDIO", "TEXT"],  # Allow both for flexibility
@@ -106,156 +218,125 @@ async def start_agent_session(user_id, is_audio=False):
         )
     else:
         # For text input, enable text output only
-        print(f"[DEBUG] Configuring for TEXT mode - text input/output")
+        logger.debug("Configuring for TEXT mode - text input/output")
         run_config = RunConfig(
             streaming_mode="sse",
             response_modalities=["TEXT"],  # Only text responses for text input
             max_llm_calls=500
         )
     
-    print(f"[DEBUG] RunConfig created: {run_config}")
+    logger.debug("RunConfig created: %s", run_config)
     
     # Create a LiveRequestQueue for this session
     live_request_queue = LiveRequestQueue()
-    print(f"[DEBUG] LiveRequestQueue created: {live_request_queue}")
+    logger.debug("LiveRequestQueue created: %s", live_request_queue)
     
     # Start agent session
-    print(f"[DEBUG] Starting live agent run...")
+    logger.debug("Starting live agent run...")
     live_events = runner.run_live(
         session=session,
         live_request_queue=live_request_queue,
         run_config=run_config,
     )
-    print(f"[DEBUG] Live events stream created: {live_events}")
+    logger.debug("Live events stream created: %s", live_events)
     
     return live_events, live_request_queue
 
+def _audio_mode_payload(event, part):
+    """Builds the JSON payload for an event in an audio session, or None.
+
+    Audio responses take priority; partial text still goes out as backup.
+    """
+    inline = part.inline_data
+    if inline and inline.mime_type.startswith("audio/pcm"):
+        try:
+            return json_fast.dumps({
+                "mime_type": inline.mime_type,
+                "data": base64.b64encode(inline.data).decode('utf-8'),
+            })
+        except Exception as e:
+            logger.error("Error encoding audio message: %s", e)
+            return None
+    if part.text and event.partial:
+        try:
+            return json_fast.dumps({"mime_type": "text/plain", "data": part.text})
+        except (TypeError, ValueError, UnicodeError) as e:
+            logger.error("Error encoding text backup message: %s", e)
+    return None
+
+def _text_mode_payload(event, part):
+    """Builds the JSON payload for an event in a text session, or None."""
+    if part.text and event.partial:
+        try:
+            return json_fast.dumps({"mime_type": "text/plain", "data": part.text})
+        except (TypeError, ValueError, UnicodeError) as e:
+            logger.error("Error encoding text message: %s", e)
+            return json_fast.dumps({
+                "mime_type": "text/plain",
+                "data": "[Error: Unable to encode message]",
+            })
+    return None
+
+# Chosen once per stream; the per-event loop never re-checks session_mode
+_MODE_PAYLOAD_HANDLERS = {"audio": _audio_mode_payload, "text": _text_mode_payload}
+
 async def agent_to_client_sse(live_events, session_mode="text"):
-    """Agent to client communication via SSE with enhanced error handling and modality filtering"""
-    print(f"[DEBUG] Starting agent_to_client_sse stream in {session_mode} mode")
+    """Agent to client communication via SSE with enhanced error handling and modality filtering.
+
+    Yields bare JSON payload strings; the response class in sse_endpoint owns
+    the wire framing (and the keep-alive heartbeat when sse-starlette is used).
+    """
+    logger.debug("Starting agent_to_client_sse stream in %s mode", session_mode)
+    # The mode handler is resolved once here; asyncio.sleep stays a local
+    # since the loop body runs per token/audio chunk
+    handler = _MODE_PAYLOAD_HANDLERS.get(session_mode, _text_mode_payload)
+    sleep0 = asyncio.sleep
     try:
         event_count = 0
-        last_heartbeat = asyncio.get_event_loop().time()
-        
+
         async for event in live_events:
             event_count += 1
-            current_time = asyncio.get_event_loop().time()
-            print(f"[DEBUG] Event #{event_count}: turn_complete={getattr(event, 'turn_complete', None)}, interrupted={getattr(event, 'interrupted', None)}, partial={getattr(event, 'partial', None)}")
-            
-            # Send heartbeat every 30 seconds if no events
-            if current_time - last_heartbeat > 30:
-                try:
-                    heartbeat_msg = {"type": "heartbeat", "timestamp": current_time}
-                    yield f"data: {json.dumps(heartbeat_msg)}\n\n"
-                    print(f"[DEBUG] Sent heartbeat at {current_time}")
-                    last_heartbeat = current_time
-                except Exception as e:
-                    print(f"[DEBUG] Heartbeat failed: {e}")
-            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Event #%d: turn_complete=%s, interrupted=%s, partial=%s",
+                             event_count, getattr(event, 'turn_complete', None),
+                             getattr(event, 'interrupted', None), getattr(event, 'partial', None))
+
             # If the turn complete or interrupted, send it
             if event.turn_complete or event.interrupted:
-                message = {
-                    "turn_complete": event.turn_complete,
-                    "interrupted": event.interrupted,
-                }
-                try:
-                    yield f"data: {json.dumps(message)}\n\n"
-                    print(f"[AGENT TO CLIENT]: {message}")
-                    last_heartbeat = current_time
-                    continue
-                except (TypeError, ValueError) as e:
-                    print(f"Error encoding turn completion message: {e}")
-                    continue
+                payload = _TURN_PAYLOAD_TMPL % (
+                    _JSON_BOOL[event.turn_complete],
+                    _JSON_BOOL[event.interrupted],
+                )
+                yield payload
+                # Hand control back to the event loop so the frame is
+                # flushed immediately instead of batched with the next one
+                await sleep0(0)
+                logger.debug("[AGENT TO CLIENT]: %s", payload)
+                continue
 
             # Read the Content and its first Part
-            print(f"[DEBUG] Event content: {getattr(event, 'content', None)}")
+            logger.debug("Event content: %s", getattr(event, 'content', None))
             part: Part = (
                 event.content and event.content.parts and event.content.parts[0]
             )
             if not part:
-                print(f"[DEBUG] No part found in event #{event_count}")
+                logger.debug("No part found in event #%d", event_count)
                 continue
 
-            print(f"[DEBUG] Part found: text='{getattr(part, 'text', None)}', inline_data={getattr(part, 'inline_data', None)}")
-
-            # Check if this is an audio response
-            is_audio_response = part.inline_data and part.inline_data.mime_type.startswith("audio/pcm")
-            print(f"[DEBUG] Is audio response: {is_audio_response}")
-            
-            # MODALITY FILTERING: Send responses that match session mode or are dual-mode
-            if session_mode == "audio":
-                # Audio mode: prioritize audio responses but allow text as backup
-                if is_audio_response:
-                    try:
-                        audio_data = base64.b64encode(part.inline_data.data).decode('utf-8')
-                        message = {
-                            "mime_type": part.inline_data.mime_type,
-                            "data": audio_data
-                        }
-                        json_str = json.dumps(message)
-                        yield f"data: {json_str}\n\n"
-                        print(f"[AGENT TO CLIENT - AUDIO MODE]: {part.inline_data.mime_type}: {len(part.inline_data.data)} bytes")
-                        last_heartbeat = current_time
-                        continue
-                    except Exception as e:
-                        print(f"Error encoding audio message: {e}")
-                        continue
-                elif part.text and event.partial:
-                    # In audio mode, also send text as fallback/supplementary
-                    print(f"[DEBUG] Sending text response in audio mode as backup: '{part.text}'")
-                    try:
-                        safe_text = part.text.encode('utf-8', errors='ignore').decode('utf-8')
-                        message = {
-                            "mime_type": "text/plain",
-                            "data": safe_text
-                        }
-                        json_str = json.dumps(message, ensure_ascii=False)
-                        yield f"data: {json_str}\n\n"
-                        print(f"[AGENT TO CLIENT - AUDIO MODE BACKUP]: text/plain: {safe_text[:50]}...")
-                        last_heartbeat = current_time
-                    except (TypeError, ValueError, UnicodeError) as e:
-                        print(f"Error encoding text backup message: {e}")
-                    continue
-            elif session_mode == "text" and part.text and event.partial:
-                # Text mode: only send text responses
-                print(f"[DEBUG] Sending text response in text mode: '{part.text}'")
-                try:
-                    # Ensure text is properly encoded and safe for JSON
-                    safe_text = part.text.encode('utf-8', errors='ignore').decode('utf-8')
-                    message = {
-                        "mime_type": "text/plain",
-                        "data": safe_text
-                    }
-                    # Validate JSON serialization
-                    json_str = json.dumps(message, ensure_ascii=False)
-                    yield f"data: {json_str}\n\n"
-                    print(f"[AGENT TO CLIENT - TEXT MODE]: text/plain: {safe_text[:50]}...")
-                    last_heartbeat = current_time
-                except (TypeError, ValueError, UnicodeError) as e:
-                    print(f"Error encoding text message: {e}")
-                    # Send safe fallback
-                    fallback_message = {
-                        "mime_type": "text/plain",
-                        "data": "[Error: Unable to encode message]"
-                    }
-                    try:
-                        yield f"data: {json.dumps(fallback_message)}\n\n"
-                    except:
-                        pass
-                    continue
-            else:
-                # Skip responses that don't match the session mode
-                if is_audio_response and session_mode == "text":
-                    print(f"[DEBUG] FILTERED: Skipping audio response in text mode")
-                elif part.text and session_mode == "audio":
-                    print(f"[DEBUG] FILTERED: Skipping text response in audio mode")
-                else:
-                    print(f"[DEBUG] Skipping event: text='{getattr(part, 'text', None)}', partial={getattr(event, 'partial', None)}, audio={is_audio_response}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Part found: text=%r, inline_data=%s",
+                             getattr(part, 'text', None), getattr(part, 'inline_data', None))
+
+            # MODALITY FILTERING happens inside the mode handler bound above
+            payload = handler(event, part)
+            if payload is None:
                 continue
-                    
+            yield payload
+            await sleep0(0)
+            logger.debug("[AGENT TO CLIENT - %s MODE]: %.60s", session_mode, payload)
     except (ConnectionError, TimeoutError) as e:
-        print(f"Connection error in SSE stream: {e}")
-        print("This is likely a temporary network issue. The client will automatically reconnect.")
+        logger.error("Connection error in SSE stream: %s", e)
+        logger.info("This is likely a temporary network issue. The client will automatically reconnect.")
         # Send connection error message to client
         error_message = {
             "type": "connection_error",
@@ -263,18 +344,17 @@ async def agent_to_client_sse(live_events, session_mode="text"):
             "data": "Connection temporarily lost. Reconnecting..."
         }
         try:
-            yield f"data: {json.dumps(error_message)}\n\n"
+            yield json_fast.dumps(error_message)
+            await sleep0(0)
         except:
             pass
     except Exception as e:
-        print(f"Error in SSE stream: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error("Error in SSE stream: %s", e, exc_info=True)
         
         # Check if it's a WebSocket-related error
         error_type = type(e).__name__
         if "websocket" in str(e).lower() or "connectionclosed" in error_type.lower():
-            print("WebSocket connection error detected - this is normal for long-running connections")
+            logger.info("WebSocket connection error detected - this is normal for long-running connections")
             error_message = {
                 "type": "websocket_error", 
                 "mime_type": "text/plain",
@@ -289,192 +369,300 @@ async def agent_to_client_sse(live_events, session_mode="text"):
             }
         
         try:
-            yield f"data: {json.dumps(error_message)}\n\n"
+            yield json_fast.dumps(error_message)
+            await sleep0(0)
         except:
             pass
 
 @app.get("/")
 async def root():
-    """Serves the main interface"""
-    index_file = STATIC_DIR / "index.html"
-    if not index_file.exists():
+    """Serves the main interface from the in-memory copy"""
+    if _INDEX_BYTES is None:
         return {"error": "index.html not found", "static_dir": str(STATIC_DIR)}
-    return FileResponse(index_file)
+    return Response(content=_INDEX_BYTES, media_type="text/html")
 
 @app.get("/events/{user_id}")
 async def sse_endpoint(user_id: int, is_audio: str = "false"):
-    """SSE endpoint for agent to client communication with enhanced error handling"""
-    
-    max_retries = 3
-    retry_count = 0
-    
-    while retry_count < max_retries:
-        try:
-            # Start agent session
-            user_id_str = str(user_id)
-            live_events, live_request_queue = await start_agent_session(user_id_str, is_audio == "true")
-            
-            # Store the request queue for this user
-            active_sessions[user_id_str] = live_request_queue
-            
-            # Track session mode
-            session_mode = "audio" if is_audio == "true" else "text"
-            session_modes[user_id_str] = session_mode
-            
-            print(f"Client #{user_id} connected via SSE, audio mode: {is_audio} (attempt {retry_count + 1})")
-            
-            def cleanup():
-                try:
-                    live_request_queue.close()
-                    if user_id_str in active_sessions:
-                        del active_sessions[user_id_str]
-                    if user_id_str in session_modes:
-                        del session_modes[user_id_str]
-                    print(f"Client #{user_id} disconnected from SSE")
-                except Exception as e:
-                    print(f"Error during cleanup: {e}")
-            
-            async def event_generator():
-                try:
-                    async for data in agent_to_client_sse(live_events, session_mode):
-                        yield data
-                except (ConnectionError, TimeoutError) as e:
-                    print(f"Connection error in event generator: {e}")
-                    # Send reconnection message
-                    error_msg = {
-                        "type": "reconnect",
-                        "mime_type": "text/plain",
-                        "data": "Connection lost. Please refresh to reconnect."
-                    }
-                    yield f"data: {json.dumps(error_msg)}\n\n"
-                except Exception as e:
-                    print(f"Error in event generator: {e}")
-                    # Send error to client
-                    error_msg = {
-                        "type": "error",
-                        "mime_type": "text/plain",
-                        "data": f"Stream error: {str(e)}"
-                    }
-                    yield f"data: {json.dumps(error_msg)}\n\n"
-                finally:
-                    cleanup()
-            
-            return StreamingResponse(
-                event_generator(),
-                media_type="text/event-stream",
-                headers={
-                    "Cache-Control": "no-cache",
-                    "Connection": "keep-alive",
-                    "Access-Control-Allow-Origin": "*",
-                    "Access-Control-Allow-Headers": "Cache-Control",
-                    "X-Accel-Buffering": "no",  # Disable nginx buffering
+    """SSE endpoint for agent to client communication with enhanced error handling.
+
+    No server-side retry loop: EventSource reconnects on its own (the first
+    frame sets retry: 3000), and retrying here would allocate a fresh
+    session per attempt while the client holds a dead connection.
+    """
+    try:
+        # Start agent session
+        user_id_str = str(user_id)
+        live_events, live_request_queue = await start_agent_session(user_id_str, is_audio == "true")
+        
+        # Store the session (queue + mode) for this user
+        session_mode = "audio" if is_audio == "true" else "text"
+        loop = asyncio.get_running_loop()
+        sessions[user_id_str] = Session(
+            queue=live_request_queue,
+            mode=session_mode,
+            last_seen=loop.time(),
+        )
+        
+        logger.info("Client #%s connected via SSE, audio mode: %s", user_id, is_audio)
+        
+        def cleanup():
+            try:
+                live_request_queue.close()
+                sessions.pop(user_id_str, None)
+                logger.info("Client #%s disconnected from SSE", user_id)
+            except Exception as e:
+                logger.error("Error during cleanup: %s", e)
+        
+        async def event_generator():
+            try:
+                async for data in agent_to_client_sse(live_events, session_mode):
+                    yield data
+            except (ConnectionError, TimeoutError) as e:
+                logger.error("Connection error in event generator: %s", e)
+                # Send reconnection message
+                error_msg = {
+                    "type": "reconnect",
+                    "mime_type": "text/plain",
+                    "data": "Connection lost. Please refresh to reconnect."
                 }
-            )
-            
-        except Exception as e:
-            retry_count += 1
-            print(f"Error creating SSE endpoint (attempt {retry_count}): {e}")
-            if retry_count >= max_retries:
-                return {"error": f"Failed to create SSE connection after {max_retries} attempts: {str(e)}"}
-            else:
-                print(f"Retrying SSE connection... ({retry_count}/{max_retries})")
-                await asyncio.sleep(1)  # Wait 1 second before retry
+                yield json_fast.dumps(error_msg)
+            except Exception as e:
+                logger.error("Error in event generator: %s", e)
+                # Send error to client
+                error_msg = {
+                    "type": "error",
+                    "mime_type": "text/plain",
+                    "data": f"Stream error: {str(e)}"
+                }
+                yield json_fast.dumps(error_msg)
+            finally:
+                # Cancel the upstream generator now rather than at GC:
+                # async-gen finalization is non-deterministic and would
+                # leave the live queue open after a client disconnect
+                try:
+                    await live_events.aclose()
+                except Exception:
+                    pass
+                cleanup()
+
+        if EventSourceResponse is not None:
+            # Library-side framing: ping=15 replaces the old manual
+            # heartbeat, and the no-cache / X-Accel-Buffering headers
+            # are set by sse-starlette itself.
+            async def sse_events():
+                # First frame sets the client-side reconnect interval
+                yield ServerSentEvent(retry=3000, comment="connected")
+                async for payload in event_generator():
+                    yield ServerSentEvent(data=payload)
+
+            return EventSourceResponse(sse_events(), ping=15)
+
+        async def framed_events():
+            # bytes frames skip Starlette's per-chunk UTF-8 encode; only the
+            # payload itself is encoded, the framing stays precompiled
+            yield b"retry: 3000\n\n"
+            async for payload in event_generator():
+                yield b"data: %b\n\n" % payload.encode()
+
+        return StreamingResponse(
+            framed_events(),
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "Connection": "keep-alive",
+                "Access-Control-Allow-Origin": "*",
+                "Access-Control-Allow-Headers": "Cache-Control",
+                "X-Accel-Buffering": "no",  # Disable nginx buffering
+            }
+        )
         
+    except Exception as e:
+        logger.error("Error creating SSE endpoint: %s", e)
+        raise HTTPException(status_code=503, detail=f"Failed to create SSE connection: {str(e)}")
+
 @app.post("/send/{user_id}")
 async def send_message_endpoint(user_id: int, request: Request):
     """HTTP endpoint for client to agent communication with modality validation"""
     
     user_id_str = str(user_id)
-    print(f"[DEBUG] Received message from user {user_id_str}")
+    logger.debug("Received message from user %s", user_id_str)
     
-    # Get the live request queue for this user
-    live_request_queue = active_sessions.get(user_id_str)
-    if not live_request_queue:
-        print(f"[DEBUG] No session found for user {user_id_str}")
+    # Reject oversized payloads before reading the body at all
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > 16 * 1024 * 1024:
+        logger.error("Request body too large: %s bytes", content_length)
+        return {"error": "Payload too large"}
+    
+    # Single lookup resolves queue and mode together
+    sess = sessions.get(user_id_str)
+    if not sess:
+        logger.debug("No session found for user %s", user_id_str)
         return {"error": "Session not found"}
+    sess.last_seen = asyncio.get_running_loop().time()
+    live_request_queue = sess.queue
+    current_session_mode = sess.mode
+    logger.debug("Current session mode: %s", current_session_mode)
     
-    # Get the session mode for this user
-    current_session_mode = session_modes.get(user_id_str, "text")
-    print(f"[DEBUG] Current session mode: {current_session_mode}")
+    # Raw PCM fast path: an application/octet-stream body skips the base64
+    # round-trip (33% wire inflation + decode CPU) entirely
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("application/octet-stream"):
+        decoded_data = await request.body()
+        if len(decoded_data) == 0:
+            logger.error("Empty audio data received")
+            return {"error": "Empty audio data"}
+        if len(decoded_data) % 2 != 0:
+            logger.error("Invalid PCM data length: %d (must be even)", len(decoded_data))
+            return {"error": "Invalid PCM data format"}
+        if len(decoded_data) > 10 * 1024 * 1024:  # 10MB limit
+            logger.error("Audio data too large: %d bytes", len(decoded_data))
+            return {"error": "Audio data too large"}
+        live_request_queue.send_realtime(Blob(data=decoded_data, mime_type="audio/pcm"))
+        logger.debug("[CLIENT TO AGENT]: audio/pcm (raw): %d bytes", len(decoded_data))
+        return {"status": "sent"}
     
     # Parse the message
     message = await request.json()
     mime_type = message["mime_type"]
     data = message["data"]
-    print(f"[DEBUG] Message parsed: mime_type={mime_type}, data length={len(data)}")
+    logger.debug("Message parsed: mime_type=%s, data length=%d", mime_type, len(data))
     
     # Filter out "Thinking" messages that seem to be sent automatically
     if mime_type == "text/plain" and data.strip().lower() in ["thinking", "ai is thinking"]:
-        print(f"[FILTERED]: Ignoring auto-sent 'Thinking' message from client")
+        logger.debug("Ignoring auto-sent 'Thinking' message from client")
         return {"status": "filtered"}
     
     # MODALITY VALIDATION: Ensure input matches session mode (relaxed for better UX)
     if current_session_mode == "text" and mime_type in ["audio/pcm", "audio/wav"]:
-        print(f"[WARNING]: Audio input in text session mode - consider switching to audio mode")
+        logger.warning("Audio input in text session mode - consider switching to audio mode")
         # Allow but warn - user might want to switch modes
         # return {"error": "Audio input not supported in text mode session"}
     elif current_session_mode == "audio" and mime_type == "text/plain":
-        print(f"[WARNING]: Text input in audio session mode - processing anyway")
+        logger.warning("Text input in audio session mode - processing anyway")
         # Allow text input in audio mode for better flexibility
     
     # Send the message to the agent
     if mime_type == "text/plain":
-        print(f"[DEBUG] Sending text content to agent")
+        logger.debug("Sending text content to agent")
         content = Content(role="user", parts=[Part.from_text(text=data)])
         live_request_queue.send_content(content=content)
-        print(f"[CLIENT TO AGENT]: {data} (text mode)")
+        logger.debug("[CLIENT TO AGENT]: %s (text mode)", data)
     elif mime_type == "audio/pcm":
-        print(f"[DEBUG] Sending PCM audio content to agent")
-        # Handle PCM audio input (proper format for ADK)
-        decoded_data = base64.b64decode(data)
+        logger.debug("Sending PCM audio content to agent")
+        # Handle PCM audio input (proper format for ADK). Decoded off the
+        # event loop: a 10MB decode would stall every other stream
+        decoded_data = await asyncio.to_thread(_b64.b64decode, data)
         
         # Validate audio data
         if len(decoded_data) == 0:
-            print(f"[ERROR] Empty audio data received")
+            logger.error("Empty audio data received")
             return {"error": "Empty audio data"}
         
         if len(decoded_data) % 2 != 0:
-            print(f"[ERROR] Invalid PCM data length: {len(decoded_data)} (must be even)")
+            logger.error("Invalid PCM data length: %d (must be even)", len(decoded_data))
             return {"error": "Invalid PCM data format"}
         
         if len(decoded_data) > 10 * 1024 * 1024:  # 10MB limit
-            print(f"[ERROR] Audio data too large: {len(decoded_data)} bytes")
+            logger.error("Audio data too large: %d bytes", len(decoded_data))
             return {"error": "Audio data too large"}
         
-        print(f"[DEBUG] Validated PCM audio: {len(decoded_data)} bytes, {len(decoded_data)//2} samples")
+        logger.debug("Validated PCM audio: %d bytes, %d samples", len(decoded_data), len(decoded_data) // 2)
         
         try:
             live_request_queue.send_realtime(Blob(data=decoded_data, mime_type="audio/pcm"))
-            print(f"[CLIENT TO AGENT]: audio/pcm: {len(decoded_data)} bytes (audio mode)")
+            logger.debug("[CLIENT TO AGENT]: audio/pcm: %d bytes (audio mode)", len(decoded_data))
         except Exception as e:
-            print(f"[ERROR] Failed to send audio to agent: {e}")
+            logger.error("Failed to send audio to agent: %s", e)
             return {"error": f"Failed to process audio: {str(e)}"}
     elif mime_type == "audio/wav":
-        print(f"[DEBUG] Converting WAV to PCM and sending to agent")
-        # Handle WAV audio input - need to convert to PCM
-        decoded_data = base64.b64decode(data)
-        # TODO: Add proper WAV to PCM conversion if needed
-        # For now, assume the frontend sends proper PCM data with wav label
-        live_request_queue.send_realtime(Blob(data=decoded_data, mime_type="audio/pcm"))
-        print(f"[CLIENT TO AGENT]: audio/wav -> audio/pcm: {len(decoded_data)} bytes (audio mode)")
+        logger.debug("Stripping WAV header and sending PCM to agent")
+        decoded_data = await asyncio.to_thread(_b64.b64decode, data)
+        # Zero-copy header parse: forwarding the whole file used to ship the
+        # 44-byte RIFF header into the PCM stream as garbled audio
+        mv = memoryview(decoded_data)
+        if len(mv) < 44 or mv[:4] != b"RIFF" or mv[8:12] != b"WAVE":
+            logger.error("Invalid WAV data received")
+            return {"error": "Invalid WAV data"}
+        # fmt chunk size sits at offset 16; the data chunk follows the fmt
+        # payload plus its own 8-byte id+size header
+        fmt_size = struct.unpack_from("<I", mv, 16)[0]
+        channels = struct.unpack_from("<H", mv, 22)[0]
+        sample_rate = struct.unpack_from("<I", mv, 24)[0]
+        if channels != 1:
+            logger.warning("Unexpected WAV format: %dch @ %dHz", channels, sample_rate)
+        data_offset = 20 + fmt_size + 8
+        if data_offset >= len(mv):
+            logger.error("WAV data chunk missing or truncated")
+            return {"error": "Invalid WAV data"}
+        pcm = bytes(mv[data_offset:])
+        live_request_queue.send_realtime(Blob(data=pcm, mime_type="audio/pcm"))
+        logger.debug("[CLIENT TO AGENT]: audio/wav -> audio/pcm: %d bytes (audio mode)", len(pcm))
     elif mime_type.startswith("image/"):
-        print(f"[DEBUG] Sending image content to agent")
+        logger.debug("Sending image content to agent")
         # Handle image uploads - keep current session mode
-        decoded_data = base64.b64decode(data)
+        decoded_data = await asyncio.to_thread(_b64.b64decode, data)
         content = Content(role="user", parts=[Part.from_image_data(mime_type=mime_type, data=decoded_data)])
         live_request_queue.send_content(content=content)
-        print(f"[CLIENT TO AGENT]: {mime_type}: {len(decoded_data)} bytes")
+        logger.debug("[CLIENT TO AGENT]: %s: %d bytes", mime_type, len(decoded_data))
     else:
-        print(f"[DEBUG] Unsupported mime type: {mime_type}")
+        logger.debug("Unsupported mime type: %s", mime_type)
         return {"error": f"Mime type not supported: {mime_type}"}
     
-    print(f"[DEBUG] Message sent successfully to agent")
+    logger.debug("Message sent successfully to agent")
     return {"status": "sent"}
 
+@app.websocket("/ws/{user_id}")
+async def websocket_endpoint(websocket: WebSocket, user_id: int, is_audio: str = "false"):
+    """WebSocket endpoint sending PCM audio as binary frames.
+
+    Audio is the largest payload; raw bytes frames avoid the base64 +
+    JSON-envelope inflation the SSE channel pays. Text deltas and turn
+    status still travel as JSON text frames. SSE remains the channel for
+    text-only sessions.
+    """
+    await websocket.accept()
+    user_id_str = str(user_id)
+    live_events, live_request_queue = await start_agent_session(user_id_str, is_audio == "true")
+    sessions[user_id_str] = Session(
+        queue=live_request_queue,
+        mode="audio" if is_audio == "true" else "text",
+        last_seen=asyncio.get_running_loop().time(),
+    )
+    logger.info("Client #%s connected via WebSocket, audio mode: %s", user_id, is_audio)
+    try:
+        async for event in live_events:
+            if event.turn_complete or event.interrupted:
+                await websocket.send_text(_TURN_PAYLOAD_TMPL % (
+                    _JSON_BOOL[event.turn_complete],
+                    _JSON_BOOL[event.interrupted],
+                ))
+                continue
+            part = (
+                event.content and event.content.parts and event.content.parts[0]
+            )
+            if not part:
+                continue
+            if part.inline_data and part.inline_data.mime_type.startswith("audio/pcm"):
+                await websocket.send_bytes(part.inline_data.data)
+            elif part.text and event.partial:
+                await websocket.send_text(json_fast.dumps({
+                    "mime_type": "text/plain",
+                    "data": part.text,
+                }))
+    except Exception as e:
+        logger.error("Error in WebSocket stream: %s", e)
+    finally:
+        try:
+            live_request_queue.close()
+        except Exception:
+            pass
+        sessions.pop(user_id_str, None)
+        logger.info("Client #%s disconnected from WebSocket", user_id)
+
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "agent": "farmer_ai", "version": "1.0.0"}
+    """Health check endpoint (preserialized constant body)"""
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
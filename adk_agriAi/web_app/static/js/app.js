@@ -8,8 +8,10 @@
 const sessionId = Math.random().toString().substring(10);
 const sse_url = "http://" + window.location.host + "/events/" + sessionId;
 const send_url = "http://" + window.location.host + "/send/" + sessionId;
+const ws_url = (window.location.protocol === 'https:' ? 'wss://' : 'ws://') + window.location.host + "/ws/" + sessionId;
 
 let eventSource = null;
+let audioSocket = null;
 let is_audio = false;
 let currentMessageId = null;
 let isRecording = false;
@@ -92,6 +94,7 @@ function handleSendMessage() {
     // Switch to text mode if currently in audio mode
     if (is_audio) {
         is_audio = false;
+        closeAudioWS();
         connectSSE(); // Reconnect in text mode
     }
     
@@ -194,10 +197,11 @@ async function toggleRecording() {
                     // Display audio message indicator
                     displayMessage('🎤 Voice message sent', 'user');
                     
-                    // Switch to audio mode and reconnect SSE
+                    // Switch to audio mode: prefer the binary WebSocket
+                    // channel (raw PCM frames, no base64/JSON per chunk)
                     if (!is_audio) {
                         is_audio = true;
-                        connectSSE(); // Reconnect in audio mode
+                        connectAudioWS();
                     }
                     
                     // Send to agent as audio/pcm (proper format)
@@ -232,6 +236,57 @@ async function toggleRecording() {
     }
 }
 
+// WebSocket connection for audio sessions: server sends raw PCM as binary
+// frames, so playback skips the atob() byte loop entirely
+function connectAudioWS() {
+    if (eventSource) {
+        eventSource.close();
+        eventSource = null;
+    }
+    closeAudioWS();
+
+    updateConnectionStatus('connecting');
+
+    audioSocket = new WebSocket(ws_url + "?is_audio=true");
+    audioSocket.binaryType = 'arraybuffer';
+
+    audioSocket.onopen = function() {
+        updateConnectionStatus('connected');
+        sendBtn.disabled = messageInput.value.trim().length === 0;
+        console.log("Audio WebSocket opened.");
+    };
+
+    audioSocket.onmessage = function(event) {
+        if (event.data instanceof ArrayBuffer) {
+            hideTypingIndicator();
+            playAudioArray(new Int16Array(event.data));
+            return;
+        }
+        handleAgentMessage(JSON.parse(event.data));
+    };
+
+    audioSocket.onerror = function() {
+        console.log("Audio WebSocket error - falling back to SSE.");
+        closeAudioWS();
+        connectSSE();
+    };
+
+    audioSocket.onclose = function() {
+        if (is_audio) {
+            updateConnectionStatus('disconnected');
+        }
+    };
+}
+
+function closeAudioWS() {
+    if (audioSocket) {
+        audioSocket.onclose = null;
+        audioSocket.onerror = null;
+        audioSocket.close();
+        audioSocket = null;
+    }
+}
+
 // SSE Connection Management
 function connectSSE() {
     if (eventSource) {
@@ -358,6 +413,53 @@ function pcmToWav(pcmData, sampleRate = 24000, numChannels = 1, bitDepth = 16) {
     return arrayBuffer;
 }
 
+function playAudioArray(audioArray) {
+    try {
+        // Convert PCM to WAV format with proper sample rate
+        const wavBuffer = pcmToWav(audioArray, 24000); // Google ADK typically uses 24kHz
+        const audioBlob = new Blob([wavBuffer], { type: 'audio/wav' });
+        const audioUrl = URL.createObjectURL(audioBlob);
+        
+        // Display audio message if we don't have one yet
+        if (!currentMessageId) {
+            currentMessageId = 'msg_' + Date.now();
+            displayMessage('🔊 Playing audio response...', 'agent', currentMessageId);
+        }
+        
+        // Create and play audio element
+        const audio = new Audio(audioUrl);
+        audio.volume = 0.8; // Set reasonable volume
+        
+        audio.play().then(() => {
+            const messageElement = document.getElementById(currentMessageId);
+            if (messageElement) {
+                const contentElement = messageElement.querySelector('.message-content');
+                contentElement.textContent = '🔊 Audio response';
+            }
+        }).catch(error => {
+            console.error("Error playing audio:", error);
+            const messageElement = document.getElementById(currentMessageId);
+            if (messageElement) {
+                const contentElement = messageElement.querySelector('.message-content');
+                contentElement.textContent = '🔊 Audio response (playback failed - check browser audio permissions)';
+            }
+        });
+        
+        // Clean up URL after playing
+        audio.onended = () => {
+            URL.revokeObjectURL(audioUrl);
+            const messageElement = document.getElementById(currentMessageId);
+            if (messageElement) {
+                const contentElement = messageElement.querySelector('.message-content');
+                contentElement.textContent = '🔊 Audio response (completed)';
+            }
+        };
+    } catch (error) {
+        console.error("Error processing audio:", error);
+        displayMessage('🔊 Audio response (processing failed)', 'agent');
+    }
+}
+
 function handleAgentMessage(message) {
     // Check if turn is complete
     if (message.turn_complete && message.turn_complete === true) {
@@ -374,73 +476,10 @@ function handleAgentMessage(message) {
         
         // Create audio element and play
         try {
-            // Convert base64 to binary data
-            const binaryString = atob(message.data);
-            
-            // Convert binary string to Int16Array for proper PCM handling
-            const audioArray = new Int16Array(binaryString.length / 2);
-            for (let i = 0; i < audioArray.length; i++) {
-                // Properly read 16-bit little-endian PCM data
-                const byte1 = binaryString.charCodeAt(i * 2) & 0xFF;
-                const byte2 = binaryString.charCodeAt(i * 2 + 1) & 0xFF;
-                audioArray[i] = (byte2 << 8) | byte1;
-                // Convert unsigned to signed if needed
-                if (audioArray[i] > 32767) {
-                    audioArray[i] -= 65536;
-                }
-            }
-            
-            // Convert PCM to WAV format with proper sample rate
-            const wavBuffer = pcmToWav(audioArray, 24000); // Google ADK typically uses 24kHz
-            const audioBlob = new Blob([wavBuffer], { type: 'audio/wav' });
-            const audioUrl = URL.createObjectURL(audioBlob);
-            
-            // Display audio message if we don't have one yet
-            if (!currentMessageId) {
-                currentMessageId = 'msg_' + Date.now();
-                displayMessage('🔊 Playing audio response...', 'agent', currentMessageId);
-            }
-            
-            // Create and play audio element
-            const audio = new Audio(audioUrl);
-            audio.volume = 0.8; // Set reasonable volume
-            
-            audio.onloadstart = () => {
-                console.log("Audio loading started");
-            };
-            
-            audio.oncanplay = () => {
-                console.log("Audio can start playing");
-            };
-            
-            audio.play().then(() => {
-                console.log("Audio playing successfully");
-                // Update message to show it's playing
-                const messageElement = document.getElementById(currentMessageId);
-                if (messageElement) {
-                    const contentElement = messageElement.querySelector('.message-content');
-                    contentElement.textContent = '🔊 Audio response';
-                }
-            }).catch(error => {
-                console.error("Error playing audio:", error);
-                // Fallback: show text indicator
-                const messageElement = document.getElementById(currentMessageId);
-                if (messageElement) {
-                    const contentElement = messageElement.querySelector('.message-content');
-                    contentElement.textContent = '🔊 Audio response (playback failed - check browser audio permissions)';
-                }
-            });
-            
-            // Clean up URL after playing
-            audio.onended = () => {
-                URL.revokeObjectURL(audioUrl);
-                const messageElement = document.getElementById(currentMessageId);
-                if (messageElement) {
-                    const contentElement = messageElement.querySelector('.message-content');
-                    contentElement.textContent = '🔊 Audio response (completed)';
-                }
-            };
-            
+            // Convert base64 to binary data (SSE path only; WS delivers
+            // ArrayBuffers straight to playAudioArray)
+            const audioArray = new Int16Array(base64ToArray(message.data));
+            playAudioArray(audioArray);
         } catch (error) {
             console.error("Error processing audio:", error);
             displayMessage('🔊 Audio response (processing failed)', 'agent');
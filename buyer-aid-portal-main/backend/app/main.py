@@ -1,7 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import campaigns, contracts, orders, bids
-from app.services.firestore_config import init_firestore
+from app.services.firestore_config import init_firestore, get_async_db
 
 app = FastAPI(title="Buyer Aid Portal API", version="1.0.0")
 
@@ -17,6 +17,12 @@ app.add_middleware(
 # Initialize Firestore
 init_firestore()
 
+@app.on_event("startup")
+async def _pin_firestore_state():
+    """Resolve the async client and hot collection refs once at startup"""
+    app.state.db = get_async_db()
+    app.state.orders_col = app.state.db.collection("orders")
+
 # Include routers
 app.include_router(campaigns.router, prefix="/api/campaigns", tags=["campaigns"])
 app.include_router(contracts.router, prefix="/api/contracts", tags=["contracts"])
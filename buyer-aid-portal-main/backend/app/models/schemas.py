@@ -123,8 +123,12 @@ class MessageResponse(BaseModel):
 class ListResponse(BaseModel):
     data: list
     count: int
+    next_cursor: Optional[str] = Field(None, alias="nextCursor")  # last doc id for cursor pagination
     success: bool = True
 
+    class Config:
+        populate_by_name = True
+
 # Bidding-specific Response Models
 class BidResponse(BaseModel):
     bid: Bid
@@ -1,7 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import campaigns, contracts, orders, bids
-from app.services.firestore_config import init_firestore
+from app.services.firestore_config import init_firestore, get_async_db
 
 app = FastAPI(title="Farmer Aid Portal API", version="1.0.0")
 
@@ -17,6 +17,13 @@ app.add_middleware(
 # Initialize Firestore
 init_firestore()
 
+@app.on_event("startup")
+async def startup():
+    """Pin the shared async client and hot collection refs on app.state so
+    handlers skip the get_db() resolution and reference construction"""
+    app.state.db = get_async_db()
+    app.state.orders_col = app.state.db.collection("orders")
+
 # Include routers
 app.include_router(campaigns.router, prefix="/api/campaigns", tags=["campaigns"])
 app.include_router(contracts.router, prefix="/api/contracts", tags=["contracts"])
@@ -1,22 +1,71 @@
-from pydantic import BaseModel, Field
-from typing import Optional, Literal, List
-from datetime import datetime
+import re
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_serializer, field_validator
+from pydantic.dataclasses import dataclass
+from typing import Generic, Optional, Literal, List, TypeVar
+from datetime import datetime, timezone
+from decimal import Decimal
+
+# Shared model config: aliases stay populate-by-name, stray Firestore keys
+# are dropped, string fields are trimmed, and validators compile eagerly at
+# import so the first request doesn't pay the schema build
+_CFG = ConfigDict(
+    populate_by_name=True,
+    extra="ignore",
+    str_strip_whitespace=True,
+    defer_build=False,
+)
 
 # User Types
 UserType = Literal["farmer", "buyer"]
 
-# Campaign Models
-class CampaignBase(BaseModel):
+# Timezone-aware UTC timestamps: the local-timezone lookup in datetime.now()
+# is skipped and naive/aware mixups in downstream sorts go away
+_UTC = timezone.utc
+
+def _now():
+    return datetime.now(_UTC)
+
+# Money arrives from the frontend as display strings ("₹12,500"); strip the
+# currency noise once at ingress so pydantic-core parses a plain Decimal
+_MONEY_NOISE = re.compile(r"[^\d.\-]")
+
+def _clean_money(value):
+    if isinstance(value, str):
+        return _MONEY_NOISE.sub("", value) or None
+    return value
+
+# Firestore's value encoder has no Decimal branch, so money goes back out
+# as float; every model with money fields serializes through this
+def _money_out(value) -> float:
+    return float(value)
+
+# Shared listing fields: campaigns and contracts describe the same market
+# item, so the common block compiles to a single core schema instead of two
+class _MarketItemBase(BaseModel):
     title: str
     crop: str
     crop_type: str = Field(..., alias="cropType")
     location: str
     duration: str
     estimated_yield: str = Field(..., alias="estimatedYield")
-    minimum_quotation: Optional[str] = Field(None, alias="minimumQuotation")  # Optional for buyer requests
-    current_bid: Optional[str] = Field(None, alias="currentBid")  # Will be set by farmers
+
+    model_config = _CFG
+
+# Campaign Models
+class CampaignBase(_MarketItemBase):
+    minimum_quotation: Optional[Decimal] = Field(None, alias="minimumQuotation", max_digits=18, decimal_places=2)  # Optional for buyer requests
+    current_bid: Optional[Decimal] = Field(None, alias="currentBid", max_digits=18, decimal_places=2)  # Will be set by farmers
     total_bids: int = Field(default=0, alias="totalBids")
 
+    @field_validator("minimum_quotation", "current_bid", mode="before")
+    @classmethod
+    def _coerce_money(cls, value):
+        return _clean_money(value)
+
+    @field_serializer("minimum_quotation", "current_bid", when_used="unless-none")
+    def _money_to_float(self, value):
+        return _money_out(value)
+
 class CampaignCreate(CampaignBase):
     status: Literal["active", "completed", "upcoming"] = "upcoming"
     user_type: UserType = Field(default="farmer", alias="userType")  # Who created this campaign
@@ -27,11 +76,10 @@ class Campaign(CampaignBase):
     status: Literal["active", "completed", "upcoming"]
     user_type: UserType = Field(default="farmer", alias="userType")
     user_id: Optional[str] = Field(default=None, alias="userId")
-    created_at: Optional[datetime] = Field(default_factory=datetime.now, alias="createdAt")
-    updated_at: Optional[datetime] = Field(default_factory=datetime.now, alias="updatedAt")
+    created_at: Optional[datetime] = Field(default_factory=_now, alias="createdAt")
+    updated_at: Optional[datetime] = Field(default_factory=_now, alias="updatedAt")
 
-    class Config:
-        populate_by_name = True
+    model_config = _CFG
 
 # Bid Models
 class BidBase(BaseModel):
@@ -39,54 +87,83 @@ class BidBase(BaseModel):
     bidder_type: UserType = Field(..., alias="bidderType")  # farmer or buyer
     bidder_id: Optional[str] = Field(None, alias="bidderId")  # Who made the bid
     bidder_name: str = Field(..., alias="bidderName")
-    bid_amount: str = Field(..., alias="bidAmount")
+    bid_amount: Decimal = Field(..., alias="bidAmount", max_digits=18, decimal_places=2)
     quantity: str
     quality_grade: str = Field(default="Grade A", alias="qualityGrade")
     delivery_terms: Optional[str] = Field(None, alias="deliveryTerms")
     notes: Optional[str] = None
 
+    @field_validator("bid_amount", mode="before")
+    @classmethod
+    def _coerce_money(cls, value):
+        return _clean_money(value)
+
+    @field_serializer("bid_amount", when_used="unless-none")
+    def _money_to_float(self, value):
+        return _money_out(value)
+
 class BidCreate(BidBase):
     status: Literal["pending", "accepted", "rejected", "counter_offered"] = "pending"
 
 class BidAction(BaseModel):
     action: Literal["accept", "reject", "counter"]
-    counter_amount: Optional[str] = Field(None, alias="counterAmount")
+    counter_amount: Optional[Decimal] = Field(None, alias="counterAmount", max_digits=18, decimal_places=2)
     counter_terms: Optional[str] = Field(None, alias="counterTerms")
     notes: Optional[str] = None
 
+    @field_validator("counter_amount", mode="before")
+    @classmethod
+    def _coerce_money(cls, value):
+        return _clean_money(value)
+
+    @field_serializer("counter_amount", when_used="unless-none")
+    def _money_to_float(self, value):
+        return _money_out(value)
+
 class Bid(BidBase):
     id: Optional[str] = None
     status: Literal["pending", "accepted", "rejected", "counter_offered"]
-    created_at: Optional[datetime] = Field(default_factory=datetime.now, alias="createdAt")
-    updated_at: Optional[datetime] = Field(default_factory=datetime.now, alias="updatedAt")
+    created_at: Optional[datetime] = Field(default_factory=_now, alias="createdAt")
+    updated_at: Optional[datetime] = Field(default_factory=_now, alias="updatedAt")
 
-    class Config:
-        populate_by_name = True
+    model_config = _CFG
 
 # Bidding Action Models
 class BidAction(BaseModel):
     action: Literal["accept", "reject", "counter_offer"]
-    counter_amount: Optional[str] = Field(None, alias="counterAmount")
+    counter_amount: Optional[Decimal] = Field(None, alias="counterAmount", max_digits=18, decimal_places=2)
     notes: Optional[str] = None
 
+    @field_validator("counter_amount", mode="before")
+    @classmethod
+    def _coerce_money(cls, value):
+        return _clean_money(value)
+
+    @field_serializer("counter_amount", when_used="unless-none")
+    def _money_to_float(self, value):
+        return _money_out(value)
+
 # Enhanced Campaign with Bids
 class CampaignWithBids(Campaign):
     bids: List[Bid] = []
     active_bids_count: int = Field(default=0, alias="activeBidsCount")
-    highest_bid: Optional[str] = Field(None, alias="highestBid")
-    lowest_bid: Optional[str] = Field(None, alias="lowestBid")
+    highest_bid: Optional[Decimal] = Field(None, alias="highestBid", max_digits=18, decimal_places=2)
+    lowest_bid: Optional[Decimal] = Field(None, alias="lowestBid", max_digits=18, decimal_places=2)
+
+    @field_validator("highest_bid", "lowest_bid", mode="before")
+    @classmethod
+    def _coerce_bid_bounds(cls, value):
+        return _clean_money(value)
+
+    @field_serializer("highest_bid", "lowest_bid", when_used="unless-none")
+    def _bid_bounds_to_float(self, value):
+        return _money_out(value)
 
 # Contract Models (similar to campaigns but with contract-specific fields)
-class ContractBase(BaseModel):
-    title: str
-    crop: str
-    crop_type: str = Field(..., alias="cropType")
-    location: str
-    duration: str
-    estimated_yield: str = Field(..., alias="estimatedYield")
-    minimum_quotation: str = Field(..., alias="minimumQuotation")
-    current_bid: str = Field(..., alias="currentBid")
-    agreed_price: Optional[str] = Field(None, alias="agreedPrice")
+class ContractBase(_MarketItemBase):
+    minimum_quotation: Decimal = Field(..., alias="minimumQuotation", max_digits=18, decimal_places=2)
+    current_bid: Decimal = Field(..., alias="currentBid", max_digits=18, decimal_places=2)
+    agreed_price: Optional[Decimal] = Field(None, alias="agreedPrice", max_digits=18, decimal_places=2)
     total_bids: int = Field(..., alias="totalBids")
     farmer_name: Optional[str] = Field(None, alias="farmerName")
     buyer_name: Optional[str] = Field(None, alias="buyerName")
@@ -94,14 +171,21 @@ class ContractBase(BaseModel):
     quality_grade: Optional[str] = Field(None, alias="qualityGrade")
     delivery_terms: Optional[str] = Field(None, alias="deliveryTerms")
     contract_notes: Optional[str] = Field(None, alias="contractNotes")
-    farmer_name: Optional[str] = Field(None, alias="farmerName")
-    buyer_name: Optional[str] = Field(None, alias="buyerName")
+
+    @field_validator("minimum_quotation", "current_bid", "agreed_price", mode="before")
+    @classmethod
+    def _coerce_money(cls, value):
+        return _clean_money(value)
+
+    @field_serializer("minimum_quotation", "current_bid", "agreed_price", when_used="unless-none")
+    def _money_to_float(self, value):
+        return _money_out(value)
 
 class ContractCreate(ContractBase):
     status: Literal["active", "completed", "upcoming"] = "upcoming"
     farmer_id: Optional[str] = Field(None, alias="farmerId")
     buyer_id: Optional[str] = Field(None, alias="buyerId")
-    agreed_price: Optional[str] = Field(None, alias="agreedPrice")
+    agreed_price: Optional[Decimal] = Field(None, alias="agreedPrice", max_digits=18, decimal_places=2)
     original_campaign_id: Optional[str] = Field(None, alias="originalCampaignId")
 
 class Contract(ContractBase):
@@ -109,13 +193,12 @@ class Contract(ContractBase):
     status: Literal["active", "completed", "upcoming"]
     farmer_id: Optional[str] = Field(None, alias="farmerId")
     buyer_id: Optional[str] = Field(None, alias="buyerId")
-    agreed_price: Optional[str] = Field(None, alias="agreedPrice")
+    agreed_price: Optional[Decimal] = Field(None, alias="agreedPrice", max_digits=18, decimal_places=2)
     original_campaign_id: Optional[str] = Field(None, alias="originalCampaignId")
-    created_at: Optional[datetime] = Field(default_factory=datetime.now, alias="createdAt")
-    updated_at: Optional[datetime] = Field(default_factory=datetime.now, alias="updatedAt")
+    created_at: Optional[datetime] = Field(default_factory=_now, alias="createdAt")
+    updated_at: Optional[datetime] = Field(default_factory=_now, alias="updatedAt")
 
-    class Config:
-        populate_by_name = True
+    model_config = _CFG
 
 # Order Models
 class OrderBase(BaseModel):
@@ -124,7 +207,16 @@ class OrderBase(BaseModel):
     supplier: str
     order_date: str = Field(..., alias="orderDate")
     delivery_date: str = Field(..., alias="deliveryDate")
-    amount: str
+    amount: Decimal = Field(..., max_digits=18, decimal_places=2)
+
+    @field_validator("amount", mode="before")
+    @classmethod
+    def _coerce_money(cls, value):
+        return _clean_money(value)
+
+    @field_serializer("amount", when_used="unless-none")
+    def _money_to_float(self, value):
+        return _money_out(value)
 
 class OrderCreate(OrderBase):
     status: Literal["pending", "shipped", "delivered", "cancelled"] = "pending"
@@ -132,34 +224,57 @@ class OrderCreate(OrderBase):
 class Order(OrderBase):
     id: Optional[str] = None
     status: Literal["pending", "shipped", "delivered", "cancelled"]
-    created_at: Optional[datetime] = Field(default_factory=datetime.now, alias="createdAt")
-    updated_at: Optional[datetime] = Field(default_factory=datetime.now, alias="updatedAt")
+    created_at: Optional[datetime] = Field(default_factory=_now, alias="createdAt")
+    updated_at: Optional[datetime] = Field(default_factory=_now, alias="updatedAt")
 
-    class Config:
-        populate_by_name = True
+    model_config = _CFG
 
-# Response Models
-class MessageResponse(BaseModel):
+# Response Models. The envelopes are pure data holders, so slotted pydantic
+# dataclasses: no per-instance __dict__, faster attribute access, and they
+# still validate and serialize through FastAPI's response_model machinery.
+@dataclass(slots=True)
+class MessageResponse:
     message: str
     success: bool = True
 
-class ListResponse(BaseModel):
-    data: list
+_ItemT = TypeVar("_ItemT")
+
+class ListResponse(BaseModel, Generic[_ItemT]):
+    data: List[_ItemT]
     count: int
+    next_cursor: Optional[str] = Field(None, alias="nextCursor")  # last doc id for cursor pagination
     success: bool = True
 
+    model_config = _CFG
+
 # Bidding-specific Response Models
-class BidResponse(BaseModel):
+@dataclass(slots=True)
+class BidResponse:
     bid: Bid
     message: str
     success: bool = True
 
-class BiddingStatsResponse(BaseModel):
+@dataclass(config=_CFG, slots=True)
+class BiddingStatsResponse:
     total_campaigns: int = Field(..., alias="totalCampaigns")
     active_bids: int = Field(..., alias="activeBids")
     successful_contracts: int = Field(..., alias="successfulContracts")
-    average_bid_amount: Optional[str] = Field(None, alias="averageBidAmount")
+    average_bid_amount: Optional[Decimal] = Field(None, alias="averageBidAmount", max_digits=18, decimal_places=2)
     success: bool = True
 
-    class Config:
-        populate_by_name = True 
\ No newline at end of file
+    @field_validator("average_bid_amount", mode="before")
+    @classmethod
+    def _coerce_money(cls, value):
+        return _clean_money(value)
+
+    @field_serializer("average_bid_amount", when_used="unless-none")
+    def _money_to_float(self, value):
+        return _money_out(value)
+
+# Precompiled list validators. TypeAdapter builds its pydantic-core schema
+# once at import; routes that validate Firestore rows in bulk should reuse
+# these instead of constructing models row by row.
+CampaignListAdapter = TypeAdapter(List[Campaign])
+BidListAdapter = TypeAdapter(List[Bid])
+ContractListAdapter = TypeAdapter(List[Contract])
+OrderListAdapter = TypeAdapter(List[Order]) 
\ No newline at end of file
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
 from app.models.schemas import (
-    Bid, BidCreate, BidAction, BidResponse, CampaignWithBids, 
+    Bid, BidCreate, BidAction, BidListAdapter, BidResponse, CampaignWithBids, 
     MessageResponse, ListResponse, BiddingStatsResponse
 )
 from app.services.firestore_config import get_db
@@ -39,6 +39,9 @@ async def get_all_bids(
             bid_data['id'] = doc.id
             bids.append(bid_data)
         
+        # One bulk pass through the precompiled adapter instead of
+        # constructing models row by row
+        bids = BidListAdapter.validate_python(bids)
         return ListResponse(data=bids, count=len(bids))
         
     except Exception as e:
@@ -113,7 +116,7 @@ async def create_bid(bid: BidCreate):
         #     raise HTTPException(status_code=404, detail="Campaign not found")
         
         # Create bid document
-        bid_data = bid.model_dump(by_alias=True)
+        bid_data = bid.model_dump(by_alias=True, exclude_none=True)
         bid_data['createdAt'] = datetime.now().isoformat()
         bid_data['updatedAt'] = datetime.now().isoformat()
         
@@ -226,12 +229,13 @@ async def handle_bid_action(bid_id: str, action: BidAction):
             if not action.counter_amount:
                 raise HTTPException(status_code=400, detail="Counter amount required for counter offer")
             bid_data['status'] = 'counter_offered'
-            bid_data['counterAmount'] = action.counter_amount
+            # Decimal doesn't round-trip through Firestore; store a float
+            bid_data['counterAmount'] = float(action.counter_amount)
             message = f"Counter offer made: {action.counter_amount}"
             
             # Update the campaign's current bid to reflect the counter offer
             db.collection('campaigns').document(bid_data['campaignId']).update({
-                'currentBid': action.counter_amount,
+                'currentBid': float(action.counter_amount),
                 'updatedAt': datetime.now().isoformat()
             })
         
@@ -273,20 +277,25 @@ async def get_bidding_stats():
         contracts = list(db.collection('contracts').stream())
         successful_contracts = len(contracts)
         
-        # Calculate average bid amount
+        # Calculate average bid amount. Stored amounts are floats since the
+        # Decimal serializers landed; older documents still hold display
+        # strings, so both shapes are handled
         all_bids = list(db.collection('bids').stream())
         bid_amounts = []
         
         for bid_doc in all_bids:
             bid_data = bid_doc.to_dict()
-            if bid_data.get('bid_amount'):
+            amount = bid_data.get('bidAmount', bid_data.get('bid_amount'))
+            if not amount:
+                continue
+            if isinstance(amount, str):
                 try:
-                    amount_str = bid_data['bid_amount'].replace('₹', '').replace(',', '')
-                    bid_amounts.append(float(amount_str))
-                except:
-                    pass
+                    amount = float(amount.replace('₹', '').replace(',', ''))
+                except ValueError:
+                    continue
+            bid_amounts.append(float(amount))
         
-        average_bid = f"₹{sum(bid_amounts)/len(bid_amounts):,.0f}" if bid_amounts else None
+        average_bid = round(sum(bid_amounts) / len(bid_amounts), 2) if bid_amounts else None
         
         return BiddingStatsResponse(
             total_campaigns=total_campaigns,
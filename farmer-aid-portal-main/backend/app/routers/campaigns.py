@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException, status
 from typing import List
-from app.models.schemas import Campaign, CampaignCreate, MessageResponse, ListResponse
+from app.models.schemas import Campaign, CampaignCreate, CampaignListAdapter, MessageResponse, ListResponse
 from app.services.firestore_config import get_db
 from google.cloud.firestore_v1.base_query import FieldFilter
 import uuid
@@ -24,6 +24,9 @@ async def get_campaigns():
             campaign_data["id"] = doc.id
             campaigns.append(campaign_data)
         
+        # One bulk pass through the precompiled adapter instead of
+        # constructing models row by row
+        campaigns = CampaignListAdapter.validate_python(campaigns)
         return ListResponse(data=campaigns, count=len(campaigns))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching campaigns: {str(e)}")
@@ -54,7 +57,7 @@ async def create_campaign(campaign: CampaignCreate):
         db = get_db()
         
         # Convert Pydantic model to dict
-        campaign_data = campaign.model_dump(by_alias=True)
+        campaign_data = campaign.model_dump(by_alias=True, exclude_none=True)
         campaign_data["createdAt"] = datetime.now()
         campaign_data["updatedAt"] = datetime.now()
         
@@ -79,7 +82,9 @@ async def update_campaign(campaign_id: str, campaign: CampaignCreate):
         if not campaign_ref.get().exists:
             raise HTTPException(status_code=404, detail="Campaign not found")
         
-        # Update campaign data
+        # Update campaign data. Keep None values: a PUT replaces the
+        # document's fields, and clients clear an optional field by
+        # sending null
         campaign_data = campaign.model_dump(by_alias=True)
         campaign_data["updatedAt"] = datetime.now()
         
@@ -128,6 +133,7 @@ async def get_campaigns_by_status(status_filter: str):
             campaign_data["id"] = doc.id
             campaigns.append(campaign_data)
         
+        campaigns = CampaignListAdapter.validate_python(campaigns)
         return ListResponse(data=campaigns, count=len(campaigns))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching campaigns by status: {str(e)}") 
\ No newline at end of file
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException, status
 from typing import List
-from app.models.schemas import Contract, ContractCreate, MessageResponse, ListResponse
+from app.models.schemas import Contract, ContractCreate, ContractListAdapter, MessageResponse, ListResponse
 from app.services.firestore_config import get_db
 from google.cloud.firestore_v1.base_query import FieldFilter
 from datetime import datetime
@@ -23,6 +23,9 @@ async def get_contracts():
             contract_data["id"] = doc.id
             contracts.append(contract_data)
         
+        # One bulk pass through the precompiled adapter instead of
+        # constructing models row by row
+        contracts = ContractListAdapter.validate_python(contracts)
         return ListResponse(data=contracts, count=len(contracts))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching contracts: {str(e)}")
@@ -53,7 +56,7 @@ async def create_contract(contract: ContractCreate):
         db = get_db()
         
         # Convert Pydantic model to dict
-        contract_data = contract.model_dump(by_alias=True)
+        contract_data = contract.model_dump(by_alias=True, exclude_none=True)
         contract_data["createdAt"] = datetime.now()
         contract_data["updatedAt"] = datetime.now()
         
@@ -78,7 +81,9 @@ async def update_contract(contract_id: str, contract: ContractCreate):
         if not contract_ref.get().exists:
             raise HTTPException(status_code=404, detail="Contract not found")
         
-        # Update contract data
+        # Update contract data. Keep None values: a PUT replaces the
+        # document's fields, and clients clear an optional field by
+        # sending null
         contract_data = contract.model_dump(by_alias=True)
         contract_data["updatedAt"] = datetime.now()
         
@@ -127,6 +132,7 @@ async def get_contracts_by_status(status_filter: str):
             contract_data["id"] = doc.id
             contracts.append(contract_data)
         
+        contracts = ContractListAdapter.validate_python(contracts)
         return ListResponse(data=contracts, count=len(contracts))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching contracts by status: {str(e)}") 
\ No newline at end of file
@@ -1,91 +1,134 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List
-from app.models.schemas import Order, OrderCreate, MessageResponse, ListResponse
-from app.services.firestore_config import get_db
+import asyncio
+
+from cachetools import TTLCache
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from typing import List, Optional
+from app.models.schemas import Order, OrderCreate, OrderListAdapter, MessageResponse, ListResponse
+from google.cloud.firestore_v1 import Query as FirestoreQuery
 from google.cloud.firestore_v1.base_query import FieldFilter
-from datetime import datetime
+from google.api_core.exceptions import NotFound
+from google.cloud.firestore import SERVER_TIMESTAMP
 
 router = APIRouter()
 
 COLLECTION_NAME = "orders"
 
+# Short-lived read-through caches: a list page followed by detail views
+# re-fetches the same documents within a few seconds, and those repeats
+# can be answered from memory instead of another Firestore RPC. The list
+# cache uses a tighter TTL since pages go stale on any write.
+_order_cache = TTLCache(maxsize=10_000, ttl=5)
+_status_page_cache = TTLCache(maxsize=1_000, ttl=1)
+_cache_lock = asyncio.Lock()
+
+
+async def _invalidate_order(order_id: str):
+    """Drops a mutated order from the caches so readers never see it stale."""
+    async with _cache_lock:
+        _order_cache.pop(order_id, None)
+        _status_page_cache.clear()
+
 @router.get("/", response_model=ListResponse)
-async def get_orders():
-    """Get all orders"""
+async def get_orders(
+    request: Request,
+    limit: int = Query(default=50, ge=1, le=200),
+    start_after: Optional[str] = Query(default=None),
+):
+    """Get one page of orders (cursor-paginated by creation time)"""
     try:
-        db = get_db()
-        orders_ref = db.collection(COLLECTION_NAME)
-        docs = orders_ref.stream()
+        orders_ref = request.app.state.orders_col
+        query = orders_ref.order_by("createdAt").limit(limit)
+        if start_after:
+            cursor_snap = await orders_ref.document(start_after).get()
+            if cursor_snap.exists:
+                query = query.start_after(cursor_snap)
         
         orders = []
-        for doc in docs:
+        async for doc in query.stream():
             order_data = doc.to_dict()
             order_data["id"] = doc.id
             orders.append(order_data)
         
-        return ListResponse(data=orders, count=len(orders))
+        # Hand back the last doc id so clients can request the next page
+        next_cursor = orders[-1]["id"] if len(orders) == limit else None
+        # One bulk pass through the precompiled adapter instead of
+        # constructing models row by row
+        orders = OrderListAdapter.validate_python(orders)
+        return ListResponse(data=orders, count=len(orders), next_cursor=next_cursor)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching orders: {str(e)}")
 
 @router.get("/{order_id}", response_model=Order)
-async def get_order(order_id: str):
+async def get_order(order_id: str, request: Request):
     """Get a specific order by ID"""
     try:
-        db = get_db()
-        order_ref = db.collection(COLLECTION_NAME).document(order_id)
-        order_doc = order_ref.get()
+        async with _cache_lock:
+            cached = _order_cache.get(order_id)
+        if cached is not None:
+            return cached
+        
+        order_ref = request.app.state.orders_col.document(order_id)
+        order_doc = await order_ref.get()
         
         if not order_doc.exists:
             raise HTTPException(status_code=404, detail="Order not found")
         
         order_data = order_doc.to_dict()
         order_data["id"] = order_doc.id
-        return Order(**order_data)
+        order = Order(**order_data)
+        async with _cache_lock:
+            _order_cache[order_id] = order
+        return order
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching order: {str(e)}")
 
 @router.post("/", response_model=Order, status_code=status.HTTP_201_CREATED)
-async def create_order(order: OrderCreate):
+async def create_order(order: OrderCreate, request: Request):
     """Create a new order"""
     try:
-        db = get_db()
-        
-        # Convert Pydantic model to dict
-        order_data = order.model_dump(by_alias=True)
-        order_data["createdAt"] = datetime.now()
-        order_data["updatedAt"] = datetime.now()
+        # Convert Pydantic model to dict; timestamps are assigned by the
+        # Firestore server so they stay monotonic across API pods
+        order_data = order.model_dump(by_alias=True, exclude_none=True)
+        order_data["createdAt"] = SERVER_TIMESTAMP
+        order_data["updatedAt"] = SERVER_TIMESTAMP
         
         # Add to Firestore
-        order_ref = db.collection(COLLECTION_NAME).document()
-        order_ref.set(order_data)
+        order_ref = request.app.state.orders_col.document()
+        await order_ref.set(order_data)
         
-        # Return created order with ID
+        # Return created order with ID; the sentinels are not datetimes, so
+        # drop them and let the model defaults stand in for the response
         order_data["id"] = order_ref.id
+        del order_data["createdAt"], order_data["updatedAt"]
         return Order(**order_data)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating order: {str(e)}")
 
 @router.put("/{order_id}", response_model=Order)
-async def update_order(order_id: str, order: OrderCreate):
+async def update_order(order_id: str, order: OrderCreate, request: Request):
     """Update an existing order"""
     try:
-        db = get_db()
-        order_ref = db.collection(COLLECTION_NAME).document(order_id)
+        order_ref = request.app.state.orders_col.document(order_id)
         
-        # Check if order exists
-        if not order_ref.get().exists:
-            raise HTTPException(status_code=404, detail="Order not found")
-        
-        # Update order data
+        # Update order data; Firestore raises NotFound itself, so no
+        # existence probe round-trip (and no check-then-write race).
+        # Keep None values: a PUT replaces the document's fields, and
+        # clients clear an optional field by sending null
         order_data = order.model_dump(by_alias=True)
-        order_data["updatedAt"] = datetime.now()
+        order_data["updatedAt"] = SERVER_TIMESTAMP
         
-        order_ref.update(order_data)
+        try:
+            await order_ref.update(order_data)
+        except NotFound:
+            raise HTTPException(status_code=404, detail="Order not found")
         
-        # Return updated order
+        await _invalidate_order(order_id)
+        
+        # Return updated order (model default stands in for the server time)
         order_data["id"] = order_id
+        del order_data["updatedAt"]
         return Order(**order_data)
     except HTTPException:
         raise
@@ -93,19 +136,19 @@ async def update_order(order_id: str, order: OrderCreate):
         raise HTTPException(status_code=500, detail=f"Error updating order: {str(e)}")
 
 @router.delete("/{order_id}", response_model=MessageResponse)
-async def delete_order(order_id: str):
+async def delete_order(order_id: str, request: Request):
     """Delete an order"""
     try:
-        db = get_db()
-        order_ref = db.collection(COLLECTION_NAME).document(order_id)
+        order_ref = request.app.state.orders_col.document(order_id)
         
-        # Check if order exists
-        if not order_ref.get().exists:
+        # Delete with an exists precondition instead of a separate probe;
+        # the server rejects the write with NotFound for missing docs
+        try:
+            await order_ref.delete(option=request.app.state.db.write_option(exists=True))
+        except NotFound:
             raise HTTPException(status_code=404, detail="Order not found")
         
-        # Delete order
-        order_ref.delete()
-        
+        await _invalidate_order(order_id)
         return MessageResponse(message=f"Order {order_id} deleted successfully")
     except HTTPException:
         raise
@@ -113,49 +156,82 @@ async def delete_order(order_id: str):
         raise HTTPException(status_code=500, detail=f"Error deleting order: {str(e)}")
 
 @router.get("/status/{status_filter}", response_model=ListResponse)
-async def get_orders_by_status(status_filter: str):
-    """Get orders filtered by status"""
+async def get_orders_by_status(
+    status_filter: str,
+    request: Request,
+    limit: int = Query(default=50, ge=1, le=200),
+    start_after: Optional[str] = Query(default=None),
+):
+    """Get one page of orders filtered by status"""
     try:
-        db = get_db()
-        orders_ref = db.collection(COLLECTION_NAME)
-        query = orders_ref.where(filter=FieldFilter("status", "==", status_filter))
-        docs = query.stream()
+        page_key = (status_filter, limit, start_after)
+        async with _cache_lock:
+            cached = _status_page_cache.get(page_key)
+        if cached is not None:
+            return cached
+        
+        orders_ref = request.app.state.orders_col
+        # Served by the (status ASC, createdAt DESC) composite index declared
+        # in firestore.indexes.json; newest orders come back first
+        query = (
+            orders_ref.where(filter=FieldFilter("status", "==", status_filter))
+            .order_by("createdAt", direction=FirestoreQuery.DESCENDING)
+            .limit(limit)
+        )
+        if start_after:
+            cursor_snap = await orders_ref.document(start_after).get()
+            if cursor_snap.exists:
+                query = query.start_after(cursor_snap)
         
         orders = []
-        for doc in docs:
+        async for doc in query.stream():
             order_data = doc.to_dict()
             order_data["id"] = doc.id
             orders.append(order_data)
         
-        return ListResponse(data=orders, count=len(orders))
+        next_cursor = orders[-1]["id"] if len(orders) == limit else None
+        orders = OrderListAdapter.validate_python(orders)
+        response = ListResponse(data=orders, count=len(orders), next_cursor=next_cursor)
+        async with _cache_lock:
+            _status_page_cache[page_key] = response
+        return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching orders by status: {str(e)}")
 
 @router.patch("/{order_id}/status", response_model=Order)
-async def update_order_status(order_id: str, status_update: dict):
+async def update_order_status(order_id: str, status_update: dict, request: Request):
     """Update order status (for tracking shipments, deliveries, etc.)"""
     try:
-        db = get_db()
-        order_ref = db.collection(COLLECTION_NAME).document(order_id)
-        
-        # Check if order exists
-        order_doc = order_ref.get()
-        if not order_doc.exists:
-            raise HTTPException(status_code=404, detail="Order not found")
+        order_ref = request.app.state.orders_col.document(order_id)
         
-        # Update only the status
+        # Validate before touching the network at all
         new_status = status_update.get("status")
         if new_status not in ["pending", "shipped", "delivered", "cancelled"]:
             raise HTTPException(status_code=400, detail="Invalid status")
         
-        order_ref.update({
-            "status": new_status,
-            "updatedAt": datetime.now()
-        })
+        # The pre-image read and the patch are independent, so overlap them:
+        # wall-clock cost is max(RTT) instead of the sum, and a missing doc
+        # still surfaces as NotFound from the update
+        try:
+            order_doc, _ = await asyncio.gather(
+                order_ref.get(),
+                order_ref.update({
+                    "status": new_status,
+                    "updatedAt": SERVER_TIMESTAMP
+                }),
+            )
+        except NotFound:
+            raise HTTPException(status_code=404, detail="Order not found")
+        if not order_doc.exists:
+            raise HTTPException(status_code=404, detail="Order not found")
         
-        # Return updated order
-        updated_doc = order_ref.get()
-        order_data = updated_doc.to_dict()
+        # Build the response from the pre-image plus the patched fields
+        # instead of re-reading the document
+        await _invalidate_order(order_id)
+        
+        order_data = order_doc.to_dict()
+        order_data["status"] = new_status
+        order_data.pop("updatedAt", None)  # model default stands in for server time
         order_data["id"] = order_id
         return Order(**order_data)
     except HTTPException:
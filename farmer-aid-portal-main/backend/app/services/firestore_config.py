@@ -1,18 +1,124 @@
 import firebase_admin
-from firebase_admin import credentials, firestore
+from firebase_admin import credentials, firestore, firestore_async
+import itertools
+import operator as _operator
 import os
+import threading
+from collections import defaultdict
 from typing import Optional, Dict, Any
 import json
-from datetime import datetime
-import uuid
+from datetime import datetime, timezone
 
-# Global Firestore client
+from google.api_core.exceptions import NotFound
+from google.cloud.firestore import SERVER_TIMESTAMP
+
+# Global Firestore clients (sync for the legacy routers, async for the
+# converted ones - both share one firebase_admin app and gRPC channel pool)
 db: Optional[firestore.Client] = None
+async_db = None
 mock_db: Dict[str, Dict[str, Any]] = {}
 
+# Deterministic per-collection mock IDs: a monotonic counter never reuses
+# an ID after deletes (unlike len()+1) and an int increment is far cheaper
+# than a uuid4 for tests that create thousands of docs
+_mock_counters: Dict[str, "itertools.count"] = defaultdict(lambda: itertools.count(1))
+_mock_id_lock = threading.Lock()
+
+
+def _next_mock_id(collection_name: str) -> str:
+    """Returns the next deterministic document ID for a mock collection"""
+    with _mock_id_lock:
+        return f"doc_{next(_mock_counters[collection_name])}"
+
+
+def _resolve_server_timestamps(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Replaces SERVER_TIMESTAMP sentinels with the current UTC time.
+
+    The real server resolves the sentinel at commit time; storing it
+    verbatim would hand a non-datetime back to every subsequent read.
+    """
+    if any(value is SERVER_TIMESTAMP for value in data.values()):
+        now = datetime.now(timezone.utc)
+        return {
+            key: now if value is SERVER_TIMESTAMP else value
+            for key, value in data.items()
+        }
+    return data
+
+_MISSING = object()
+
+# Firestore comparison operators mapped to their Python equivalents; the
+# lookup happens once per query, not once per document
+_QUERY_OPS = {
+    "==": _operator.eq,
+    "!=": _operator.ne,
+    "<": _operator.lt,
+    "<=": _operator.le,
+    ">": _operator.gt,
+    ">=": _operator.ge,
+}
+
+
+class MockQuery:
+    """Filtered view over a mock collection.
+    
+    where() hands back one of these instead of cloning the whole
+    collection object, so chained filters only accumulate (field, op,
+    value) tuples. order_by/limit/start_after remain chainable no-ops
+    to match the real query surface.
+    """
+    
+    def __init__(self, collection_name: str, document_cls):
+        self.collection_name = collection_name
+        self._document_cls = document_cls
+        self._filters = []
+    
+    def where(self, field=None, operator=None, value=None, filter=None):
+        if filter is not None:
+            field, operator, value = filter.field_path, filter.op_string, filter.value
+        self._filters.append((field, _QUERY_OPS.get(operator, _operator.eq), value))
+        return self
+    
+    def order_by(self, field, direction=None):
+        return self
+    
+    def limit(self, count):
+        return self
+    
+    def start_after(self, snapshot):
+        return self
+    
+    def _matching_items(self):
+        filters = self._filters
+        for doc_id, data in mock_db.get(self.collection_name, {}).items():
+            for field, op_fn, value in filters:
+                try:
+                    if not op_fn(data.get(field, _MISSING), value):
+                        break
+                except TypeError:
+                    # Missing or incomparable field never matches
+                    break
+            else:
+                yield doc_id, data
+    
+    def stream(self):
+        for doc_id, data in self._matching_items():
+            yield self._document_cls(self.collection_name, doc_id, data)
+
+
+class MockAsyncQuery(MockQuery):
+    """Async variant whose stream() is an async generator"""
+    
+    async def stream(self):
+        for doc_id, data in self._matching_items():
+            yield self._document_cls(self.collection_name, doc_id, data)
+
+
 class MockFirestoreCollection:
     """Mock Firestore collection for testing without credentials"""
     
+    _document_cls = None  # bound below once MockFirestoreDocument exists
+    
     def __init__(self, collection_name: str):
         self.collection_name = collection_name
         if collection_name not in mock_db:
@@ -20,15 +126,15 @@ class MockFirestoreCollection:
     
     def add(self, data: Dict[str, Any]) -> str:
         """Add a document and return its ID"""
-        doc_id = f"doc_{len(mock_db[self.collection_name]) + 1}"
-        mock_db[self.collection_name][doc_id] = data
+        doc_id = _next_mock_id(self.collection_name)
+        mock_db[self.collection_name][doc_id] = _resolve_server_timestamps(data)
         return doc_id
     
     def document(self, doc_id: Optional[str] = None):
         """Get a document reference"""
         if doc_id is None:
             # Generate a new document ID when none is provided
-            doc_id = str(uuid.uuid4())
+            doc_id = _next_mock_id(self.collection_name)
         return MockFirestoreDocument(self.collection_name, doc_id)
     
     def stream(self):
@@ -38,10 +144,22 @@ class MockFirestoreCollection:
             documents.append(MockFirestoreDocument(self.collection_name, doc_id, data))
         return documents
     
-    def where(self, field, operator, value):
-        """Filter documents (simplified implementation)"""
-        # For simplicity, return all documents in test mode
-        # In a real implementation, you would filter based on field, operator, value
+    def where(self, field=None, operator=None, value=None, filter=None):
+        """Filter documents; accepts both positional and FieldFilter styles"""
+        if filter is not None:
+            field, operator, value = filter.field_path, filter.op_string, filter.value
+        return MockQuery(self.collection_name, self._document_cls).where(field, operator, value)
+    
+    def order_by(self, field, direction=None):
+        """Order documents (no-op in test mode)"""
+        return self
+    
+    def limit(self, count):
+        """Limit results (no-op in test mode)"""
+        return self
+    
+    def start_after(self, snapshot):
+        """Page past a cursor (no-op in test mode)"""
         return self
 
 class MockFirestoreDocument:
@@ -58,12 +176,12 @@ class MockFirestoreDocument:
     
     def set(self, data: Dict[str, Any]):
         """Set document data"""
-        mock_db[self.collection_name][self.id] = data
+        mock_db[self.collection_name][self.id] = _resolve_server_timestamps(data)
     
     def update(self, data: Dict[str, Any]):
         """Update document data"""
         if self.id in mock_db[self.collection_name]:
-            mock_db[self.collection_name][self.id].update(data)
+            mock_db[self.collection_name][self.id].update(_resolve_server_timestamps(data))
     
     def delete(self):
         """Delete document"""
@@ -88,12 +206,74 @@ class MockDocumentSnapshot:
     def to_dict(self) -> Dict[str, Any]:
         return mock_db[self.collection_name].get(self.id, {})
 
+MockFirestoreCollection._document_cls = MockFirestoreDocument
+
+
 class MockFirestoreClient:
     """Mock Firestore client for testing"""
     
     def collection(self, collection_name: str):
         return MockFirestoreCollection(collection_name)
 
+class MockAsyncFirestoreCollection(MockFirestoreCollection):
+    """Async mock mirroring AsyncCollectionReference's awaitable surface"""
+    
+    def where(self, field=None, operator=None, value=None, filter=None):
+        if filter is not None:
+            field, operator, value = filter.field_path, filter.op_string, filter.value
+        return MockAsyncQuery(self.collection_name, self._document_cls).where(field, operator, value)
+    
+    def document(self, doc_id: Optional[str] = None):
+        if doc_id is None:
+            doc_id = _next_mock_id(self.collection_name)
+        return MockAsyncFirestoreDocument(self.collection_name, doc_id)
+    
+    async def stream(self):
+        """Async-iterate all documents in the collection"""
+        for doc_id, data in mock_db[self.collection_name].items():
+            yield MockAsyncFirestoreDocument(self.collection_name, doc_id, data)
+
+class MockAsyncFirestoreDocument(MockFirestoreDocument):
+    """Async mock document whose operations are awaitable.
+    
+    Unlike the legacy sync mock, update and precondition-guarded delete
+    raise NotFound for missing documents - the async routers lean on
+    that instead of probing for existence first.
+    """
+    
+    async def get(self):
+        return MockDocumentSnapshot(self.collection_name, self.id)
+    
+    async def set(self, data: Dict[str, Any]):
+        MockFirestoreDocument.set(self, data)
+    
+    async def update(self, data: Dict[str, Any]):
+        if self.id not in mock_db.get(self.collection_name, {}):
+            raise NotFound(f"No document to update: {self.collection_name}/{self.id}")
+        MockFirestoreDocument.update(self, data)
+    
+    async def delete(self, option=None):
+        if (
+            option is not None
+            and option.get("exists")
+            and self.id not in mock_db.get(self.collection_name, {})
+        ):
+            raise NotFound(f"No document to delete: {self.collection_name}/{self.id}")
+        MockFirestoreDocument.delete(self)
+
+MockAsyncFirestoreCollection._document_cls = MockAsyncFirestoreDocument
+
+
+class MockAsyncFirestoreClient:
+    """Mock async Firestore client for testing"""
+    
+    def collection(self, collection_name: str):
+        return MockAsyncFirestoreCollection(collection_name)
+    
+    def write_option(self, **kwargs):
+        """Returns the precondition kwargs for the mock document to enforce"""
+        return kwargs
+
 def init_firestore():
     """Initialize Firestore database connection"""
     global db
@@ -134,6 +314,18 @@ def get_db():
         init_firestore()
     return db
 
+def get_async_db():
+    """Get the async Firestore client (non-blocking I/O for async handlers)"""
+    global async_db
+    if async_db is None:
+        # Reuse init_firestore's credential resolution; if it fell back to
+        # the mock, serve the async mock against the same in-memory store
+        if isinstance(get_db(), MockFirestoreClient):
+            async_db = MockAsyncFirestoreClient()
+        else:
+            async_db = firestore_async.client()
+    return async_db
+
 def get_mock_data():
     """Get mock database data for debugging"""
     return mock_db
@@ -141,4 +333,6 @@ def get_mock_data():
 def clear_mock_data():
     """Clear mock database data"""
     global mock_db
-    mock_db = {} 
\ No newline at end of file
+    mock_db = {}
+    with _mock_id_lock:
+        _mock_counters.clear()